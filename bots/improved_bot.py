@@ -2,14 +2,184 @@
 # Optimized for speed and handles all edge cases.
 
 import heapq
-from collections import deque
+from array import array
+from collections import Counter, deque
 
 from game_constants import FoodType, GameConstants, ShopCosts
 from item import Food, Pan, Plate
 from robot_controller import RobotController
 
+# Step codes for the precomputed step tables: code = dx * 3 + dy + 4.
+_STEP_DIRS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+_NEIGHBORS8 = ((-1, -1), (-1, 0), (-1, 1), (0, -1),
+               (0, 1), (1, -1), (1, 0), (1, 1))
+_UNREACHABLE = 32767
+# Shared empty exclusion set for optional tile-set arguments.
+_NO_TILES = frozenset()
+# After max(_SEARCH_MIN_BUDGET, _SEARCH_BUDGET_PER_STEP * k) expanded tiles, k
+# being the Chebyshev distance to the target, the A* checks once whether the
+# blocked tiles seal the target off before searching on.
+_SEARCH_MIN_BUDGET = 128
+_SEARCH_BUDGET_PER_STEP = 8
+# Routes depend only on the static map and the blocked tiles, so they are
+# kept across turns in an LRU of this many entries.
+_ROUTE_CACHE_SIZE = 1024
+
+# Debug logging (per-turn state lines, board dumps). Off for real games.
+_DEBUG = False
+
+_FOOD_TYPES = {'EGG': FoodType.EGG, 'MEAT': FoodType.MEAT, 'NOODLES': FoodType.NOODLES,
+               'ONIONS': FoodType.ONIONS, 'SAUCE': FoodType.SAUCE}
+_FOOD_COSTS = {name: ft.buy_cost for name, ft in _FOOD_TYPES.items()}
+_NEEDS_COOKING = frozenset(('EGG', 'MEAT'))
+_NEEDS_CHOPPING = frozenset(('MEAT', 'ONIONS'))
+# Bit 1 = needs chopping, bit 0 = needs cooking.
+_PREP_CLASS = {name: (name in _NEEDS_CHOPPING) * 2 + (name in _NEEDS_COOKING)
+               for name in _FOOD_TYPES}
+_TILE_CHARS = {
+    "WALL": "#",
+    "FLOOR": ".",
+    "COUNTER": "C",
+    "COOKER": "K",
+    "SINK": "S",
+    "SINKTABLE": "T",
+    "TRASH": "R",
+    "SUBMIT": "U",
+    "SHOP": "$",
+    "BOX": "B",
+}
+
+def _chebyshev(a, b):
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+
+def _build_adjacency(walkable, width, height):
+    # Per-tile tuples of (neighbour, step code from the neighbour back to the
+    # tile) over walkable tiles, in _NEIGHBORS8 order. Searches iterate these
+    # directly, so the inner loops do no bounds checks or index arithmetic.
+    adjacency = []
+    i = 0
+    for x in range(width):
+        for y in range(height):
+            edges = []
+            if walkable[i]:
+                for dx, dy in _NEIGHBORS8:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        j = nx * height + ny
+                        if walkable[j]:
+                            edges.append((j, -dx * 3 - dy + 4))
+            adjacency.append(tuple(edges))
+            i += 1
+    return tuple(adjacency)
+
+
+def _build_access(walkable, width, height):
+    # Per-tile tuples of the flat indices a bot can stand on to use the tile:
+    # the tile itself if walkable, otherwise its walkable neighbours.
+    access = []
+    i = 0
+    for x in range(width):
+        for y in range(height):
+            if walkable[i]:
+                access.append((i,))
+            else:
+                access.append(tuple(
+                    nx * height + ny for nx, ny in
+                    ((x + dx, y + dy) for dx, dy in _NEIGHBORS8)
+                    if 0 <= nx < width and 0 <= ny < height
+                    and walkable[nx * height + ny]))
+            i += 1
+    return tuple(access)
+
+
+def _label_components(adjacency, n):
+    # Connected-component id per flat tile over the adjacency (-1 for
+    # unwalkable tiles, which have no edges and are never seeded).
+    component = array('i', [-1]) * n
+    label = 0
+    for i in range(n):
+        if component[i] != -1 or not adjacency[i]:
+            continue
+        component[i] = label
+        stack = [i]
+        while stack:
+            for j, _ in adjacency[stack.pop()]:
+                if component[j] == -1:
+                    component[j] = label
+                    stack.append(j)
+        label += 1
+    return component
+
+
+def _flood_fill(walkable, width, height, sources, adjacency, blocked=()):
+    # Multi-source BFS over the adjacency with int-encoded tiles, one layer
+    # at a time. blocked holds flat indices treated as walls. Returns a flat
+    # array('h') of distances (_UNREACHABLE if none).
+    dist = array('h', [_UNREACHABLE]) * (width * height)
+    # Blocked tiles hold a sentinel during the search so the inner loop
+    # needs a single test; they are reset before returning.
+    for i in blocked:
+        dist[i] = -1
+    frontier = []
+    for sx, sy in sources:
+        if not (0 <= sx < width and 0 <= sy < height):
+            continue
+        i = sx * height + sy
+        if walkable[i] and dist[i] == _UNREACHABLE:
+            dist[i] = 0
+            frontier.append(i)
+    d = 0
+    while frontier:
+        d += 1
+        nxt = []
+        for i in frontier:
+            for j, _ in adjacency[i]:
+                if dist[j] == _UNREACHABLE:
+                    dist[j] = d
+                    nxt.append(j)
+        frontier = nxt
+    for i in blocked:
+        dist[i] = _UNREACHABLE
+    return dist
+
+
+def _reverse_bfs(walkable, width, height, tx, ty, adjacency):
+    # Layered integer BFS over the adjacency. Sources are the walkable tiles
+    # within one step of (tx, ty). Returns flat (dist, step) tables, where step
+    # is the code of the first move towards the target.
+    n = width * height
+    dist = array('h', [_UNREACHABLE]) * n
+    step = array('b', [-1]) * n
+    frontier = []
+    for x in range(max(0, tx - 1), min(width, tx + 2)):
+        for y in range(max(0, ty - 1), min(height, ty + 2)):
+            i = x * height + y
+            if walkable[i]:
+                dist[i] = 0
+                step[i] = 4
+                frontier.append(i)
+    d = 0
+    while frontier:
+        d += 1
+        nxt = []
+        for i in frontier:
+            for j, back in adjacency[i]:
+                if dist[j] == _UNREACHABLE:
+                    dist[j] = d
+                    # Moving from j back towards i.
+                    step[j] = back
+                    nxt.append(j)
+        frontier = nxt
+    return dist, step
+
 
 class BotState:
+    __slots__ = ('task_stage', 'sub_state', 'ingredients_needed', 'plate_counter',
+                 'work_counter', 'current_order', 'cooker_target', 'zone_anchor',
+                 'pending_order_ids', 'pending_items', 'handoff_queue',
+                 'assist_order_id', 'assist_item', 'stuck_counter', 'last_state')
+
     def __init__(self):
         self.task_stage = 0
         self.sub_state = 0
@@ -21,7 +191,7 @@ class BotState:
         self.zone_anchor = None
         self.pending_order_ids = []
         self.pending_items = []
-        self.handoff_queue = []
+        self.handoff_queue = deque()
         self.assist_order_id = None
         self.assist_item = None
 
@@ -29,6 +199,38 @@ class BotState:
         self.stuck_counter = 0
         self.last_state = -1
 
+    def note_stage(self):
+        # Count consecutive turns spent in the same task stage.
+        stage = self.task_stage
+        if stage == self.last_state:
+            self.stuck_counter += 1
+        else:
+            self.stuck_counter = 0
+            self.last_state = stage
+        return self.stuck_counter
+
+
+class TurnContext:
+    # Per-call values shared by the stage handlers of one bot's turn.
+    def __init__(self, holding, bot_pos, my_dist, other_dist_maps, exclude_counters,
+                 reserved_counters, reserved_cookers, claimed_orders, blocked_tiles, order_heuristic,
+                 shop_pos=None, is_helper=False, reach=_NO_TILES):
+        self.holding = holding
+        self.bot_pos = bot_pos
+        self.my_dist = my_dist
+        self.other_dist_maps = other_dist_maps
+        self.exclude_counters = exclude_counters
+        self.reserved_counters = reserved_counters
+        self.reserved_cookers = reserved_cookers
+        self.claimed_orders = claimed_orders
+        self.blocked_tiles = blocked_tiles
+        self.order_heuristic = order_heuristic
+        # Only run_standard_logic picks a per-bot shop and helper mode.
+        self.shop_pos = shop_pos
+        self.is_helper = is_helper
+        # Positions this bot can act on (see BotPlayer._component_reach).
+        self.reach = reach
+
 
 class BotPlayer:
     HEURISTIC_EXPIRY = "expiry"
@@ -49,87 +251,178 @@ class BotPlayer:
         self.ingredient_sources = None
         self.ingredient_clusters = []
         self.largest_ingredient_cluster = []
-        self.landmarks = []
         self.boxes = None
+        # Tiles the engine changes between turns without a bot acting.
+        self.ticking_tiles = ()
         self.cooker_priority = []
-        self.cooker_cluster_scores = {}
+        self.cooker_scores = []
+        self.counter_shop_dists = []
+        self.counters_by_shop = []
         self.cached_map = None
+        self.width = 0
+        self.height = 0
+        self.walkable = None
+        self.adjacency = None
+        self.access = None
+        self.component = None
+        self.cooker_access = ()
+        self.shop_access = ()
+        self.counter_access = ()
+        self.step_tables = {}
+        # Unblocked distance maps from a bot's standing tile, keyed by (x, y).
+        self.start_dist_maps = {}
+        # Positions a bot can act on from each walkable component, as
+        # frozensets of (x, y); built the first time a bot stands there.
+        self.component_reach = {}
+        # Route search results, keyed by (start, target_x, target_y,
+        # frozenset(blocked)). Kept across turns; see _ROUTE_CACHE_SIZE.
+        self._route_cache = {}
         self.dist_from_shop = None
         self.dist_from_submit = None
         self.dist_from_counters = None
         self.dist_from_cookers = None
         self.critical_tiles = set()
         self.shared_handoff_counters = []
+        self.handoff_shop_to_cooker = 9999
+        self.order_legs = None
+        self.order_floors = {}
         self.primary_handoff_counter = None
         self.bot_dist_maps = {}
+        # bot_id -> this turn's component_reach entry.
+        self.bot_reach = {}
         self.handoff_happened_turn = False
         self.last_handoff_items = []
-        self.debug_board = True
+        self.debug_board = _DEBUG
+        # order_id -> Counter of its required ingredients.
+        self.required_counts = {}
         self.helper_map_active = False
         self.expiry_safety_buffer = None
 
+        # Per-turn snapshots, refreshed in play_turn.
+        self._team = None
+        self._turn = 0
+        self._bot_ids = []
+        # bot_id -> get_bot_state dict; the acting bot is always read fresh.
+        self._bot_info = {}
+        self._acting_bot = None
+        # Active, unexpired orders and the same keyed by order_id; dropped
+        # at turn start and after a submit.
+        self._orders = None
+        self._orders_by_id = {}
+        # heuristic -> _orders ranked best first, rebuilt with _orders.
+        self._ranked_orders = {}
+        # Team money; dropped at turn start and after a buy or submit.
+        self._money = None
+        self._tile_cache = {}
+        # Set once either team switches maps; from then on bots we do not
+        # track may act on our board, so the tile cache is cleared per turn.
+        self._maps_switched = False
+        self._ingredient_index = None
+        # food_name -> first box holding it; built on demand like the index.
+        self._box_index = None
+        self._free_cookers = []
+        self._panless_cookers = []
+        self._busy_pans = []
+        self._cooker_state = {}
+        self._counter_plates = []
+        self._counter_foods = []
+        self._plated_foods = []
+
         # Bot States: map bot_id -> BotState
         self.bot_states = {}
 
+        # run_normal_logic stage handlers, keyed by task_stage.
+        self._normal_handlers = {
+            0: self._normal_pick_order,
+            1: self._normal_ensure_pan,
+            2: self._normal_place_plate,
+            10: self._normal_next_ingredient,
+            11: self._normal_buy_ingredient,
+            12: self._normal_process,
+            13: self._normal_add_to_plate,
+            20: self._normal_pickup_plate,
+            21: self._normal_submit,
+            99: self._normal_trash,
+        }
+        # run_standard_logic stage handlers; stages 10 and 99 are the same
+        # on both maps.
+        self._standard_handlers = {
+            0: self._standard_pick_order,
+            1: self._standard_ensure_pan,
+            2: self._standard_place_plate,
+            10: self._normal_next_ingredient,
+            11: self._standard_buy_ingredient,
+            12: self._standard_process,
+            13: self._standard_add_to_plate,
+            20: self._standard_pickup_plate,
+            21: self._standard_submit,
+            99: self._normal_trash,
+        }
+
     def cache_locations(self, controller):
         # Cache all locations once at start.
         if self.counters is not None:
             return
 
-        m = controller.get_map(controller.get_team())
+        m = controller.get_map(self._team)
         self.cached_map = m
-        self.counters = []
-        self.cookers = []
-        self.shops = []
-        self.ingredient_sources = []
         self.ingredient_clusters = []
         self.largest_ingredient_cluster = []
-        self.landmarks = []
-        self.boxes = []
         self.cooker_priority = []
-        self.cooker_cluster_scores = {}
+        self.cooker_scores = []
         self.dist_from_shop = None
         self.dist_from_submit = None
         self.dist_from_counters = None
         self.dist_from_cookers = None
         self.critical_tiles = set()
         self.shared_handoff_counters = []
+        self.handoff_shop_to_cooker = 9999
+        self.order_legs = None
+        self.order_floors = {}
         self.primary_handoff_counter = None
         self.bot_dist_maps = {}
         self.expiry_safety_buffer = None
         self.ingredient_clusters = []
         self.largest_ingredient_cluster = []
 
-        for x in range(m.width):
-            for y in range(m.height):
-                name = m.tiles[x][y].tile_name
-                if name == "COUNTER":
-                    self.counters.append((x, y))
-                elif name == "COOKER":
-                    self.cookers.append((x, y))
-                elif name == "SHOP" and self.shop_loc is None:
-                    self.shop_loc = (x, y)
-                if name == "SHOP":
-                    self.shops.append((x, y))
-                if name in ("SHOP", "BOX"):
-                    self.ingredient_sources.append((x, y))
-                elif name == "SUBMIT" and self.submit_loc is None:
-                    self.submit_loc = (x, y)
-                elif name == "TRASH" and self.trash_loc is None:
-                    self.trash_loc = (x, y)
-                elif name == "BOX":
-                    self.boxes.append((x, y))
-
-        # Landmark weighting: shop highest, counters/chop second, submit lowest.
-        if self.shop_loc:
-            self.landmarks.append((self.shop_loc, 5))
-        if self.counters:
-            for c in self.counters:
-                self.landmarks.append((c, 2))
-        if self.submit_loc:
-            self.landmarks.append((self.submit_loc, 1))
-
-        # Precompute shortest-path distance grids for landmark proximity.
+        # Flatten the tiles once in x * height + y order, then take the static
+        # walkability snapshot and group positions by tile name.
+        self.width = m.width
+        self.height = m.height
+        tiles = [tile for column in m.tiles for tile in column]
+        self.walkable = bytearray([tile.is_walkable for tile in tiles])
+        by_name = {}
+        h = m.height
+        for i, tile in enumerate(tiles):
+            by_name.setdefault(tile.tile_name, []).append(divmod(i, h))
+
+        self.counters = by_name.get("COUNTER", [])
+        self.cookers = by_name.get("COOKER", [])
+        self.shops = by_name.get("SHOP", [])
+        self.boxes = by_name.get("BOX", [])
+        self.ticking_tiles = tuple(
+            self.cookers + by_name.get("SINK", []) + by_name.get("SINKTABLE", []))
+        self.ingredient_sources = self.shops + self.boxes
+        if self.shop_loc is None and self.shops:
+            self.shop_loc = self.shops[0]
+        if self.submit_loc is None and "SUBMIT" in by_name:
+            self.submit_loc = by_name["SUBMIT"][0]
+        if self.trash_loc is None and "TRASH" in by_name:
+            self.trash_loc = by_name["TRASH"][0]
+        self.step_tables = {}
+        self.adjacency = _build_adjacency(self.walkable, m.width, m.height)
+        self.access = _build_access(self.walkable, m.width, m.height)
+        self.component = _label_components(self.adjacency, m.width * m.height)
+        # Every standing tile next to any cooker / shop, for "can this bot
+        # use one at all" probes.
+        self.cooker_access = tuple(sorted(
+            {j for x, y in self.cookers for j in self.access[x * h + y]}))
+        self.shop_access = tuple(sorted(
+            {j for x, y in self.shops for j in self.access[x * h + y]}))
+        self.counter_access = tuple(sorted(
+            {j for x, y in self.counters for j in self.access[x * h + y]}))
+
+        # Precompute shortest-path distance grids to the main stations.
         self.dist_from_shop = self._build_dist_map(
             self._adjacent_walkables_multi(self.shops))
         self.dist_from_submit = self._build_dist_map(
@@ -140,34 +433,62 @@ class BotPlayer:
             self._adjacent_walkables_multi(self.cookers))
         self.expiry_safety_buffer = self._compute_expiry_safety_buffer()
 
+        # One pass over the counters: static shop distance per counter
+        # (aligned with self.counters), and the shared handoff counters
+        # reachable from both shops and cookers.
+        self.counter_shop_dists = []
+        self.shared_handoff_counters = []
+        # Shortest shop -> handoff counter -> cooker relay (9999 if none).
+        self.handoff_shop_to_cooker = 9999
+        check_shared = bool(self.dist_from_shop and self.dist_from_cookers)
+        for c in self.counters:
+            if self.dist_from_shop is not None:
+                d = self._distance_to_tile(self.dist_from_shop, c)
+            elif self.shop_loc:
+                d = _chebyshev(c, self.shop_loc)
+            else:
+                d = 0
+            self.counter_shop_dists.append(d)
+            if check_shared and d < 9999:
+                d_cook = self._distance_to_tile(self.dist_from_cookers, c)
+                if d_cook < 9999:
+                    self.shared_handoff_counters.append(c)
+                    if d + d_cook < self.handoff_shop_to_cooker:
+                        self.handoff_shop_to_cooker = d + d_cook
+        self.counters_by_shop = sorted(
+            range(len(self.counters)), key=self.counter_shop_dists.__getitem__)
+
         # Precompute cooker priority by shortest path closeness to shop.
-        self.cooker_cluster_scores = {}
+        # cooker_scores[i] is the shop distance of cooker_priority[i].
+        scored = []
         for cooker in self.cookers:
             if self.dist_from_shop is not None:
                 score = self._distance_to_tile(self.dist_from_shop, cooker)
             elif self.shop_loc:
-                score = self._chebyshev(cooker, self.shop_loc)
+                score = _chebyshev(cooker, self.shop_loc)
             else:
                 score = 0
-            self.cooker_cluster_scores[cooker] = score
-        self.cooker_priority = sorted(
-            self.cookers,
-            key=lambda c: (self.cooker_cluster_scores.get(c, 0), c))
+            scored.append((score, cooker))
+        scored.sort()
+        self.cooker_priority = [c for _, c in scored]
+        self.cooker_scores = [score for score, _ in scored]
 
-        # Shared handoff counters reachable from both shops and cookers.
-        self.shared_handoff_counters = []
-        if self.dist_from_shop and self.dist_from_cookers:
-            for c in self.counters:
-                if (self._distance_to_tile(self.dist_from_shop, c) < 9999 and
-                        self._distance_to_tile(self.dist_from_cookers, c) < 9999):
-                    self.shared_handoff_counters.append(c)
         if self.shared_handoff_counters:
             self.primary_handoff_counter = self.shared_handoff_counters[0]
+        self.order_legs = self._compute_order_legs()
+        self.order_floors = {}
         self.ingredient_clusters = self._compute_ingredient_clusters()
         self.largest_ingredient_cluster = self.ingredient_clusters[0] if self.ingredient_clusters else [
         ]
         self.critical_tiles = self._compute_critical_tiles()
 
+        # Step tables for the fixed stations every order visits, so the first
+        # trip to each does not pay for a BFS in the middle of a turn.
+        # Counters are left to the lazy path; most are never targeted.
+        for target in self.shops + self.cookers + [self.submit_loc, self.trash_loc]:
+            if target:
+                self._get_step_table(target)
+
     def _compute_ingredient_clusters(self):
         sources = set(self.ingredient_sources or [])
         clusters = []
@@ -181,14 +502,11 @@ class BotPlayer:
             while stack:
                 cx, cy = stack.pop()
                 cluster.append((cx, cy))
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        if dx == 0 and dy == 0:
-                            continue
-                        nx, ny = cx + dx, cy + dy
-                        if (nx, ny) in sources and (nx, ny) not in visited:
-                            visited.add((nx, ny))
-                            stack.append((nx, ny))
+                for dx, dy in _NEIGHBORS8:
+                    nx, ny = cx + dx, cy + dy
+                    if (nx, ny) in sources and (nx, ny) not in visited:
+                        visited.add((nx, ny))
+                        stack.append((nx, ny))
             clusters.append(cluster)
         clusters.sort(key=lambda c: (-len(c), min(c)))
         return clusters
@@ -196,26 +514,16 @@ class BotPlayer:
     def _compute_critical_tiles(self):
         if not self.cached_map:
             return set()
-        m = self.cached_map
-        walkable = set()
-        for x in range(m.width):
-            for y in range(m.height):
-                if m.is_tile_walkable(x, y):
-                    walkable.add((x, y))
+        h = self.height
+        walkable = {divmod(i, h) for i, w in enumerate(self.walkable) if w}
         if not walkable:
             return set()
 
+        adjacency = self.adjacency
+
         def neighbors(pos):
             x, y = pos
-            out = []
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx, ny = x + dx, y + dy
-                    if (nx, ny) in walkable:
-                        out.append((nx, ny))
-            return out
+            return [divmod(j, h) for j, _ in adjacency[x * h + y]]
 
         disc = {}
         low = {}
@@ -258,7 +566,7 @@ class BotPlayer:
             if dist_map is not None:
                 d = self._distance_to_tile(dist_map, pos)
             else:
-                d = self._chebyshev(bot_pos, pos)
+                d = _chebyshev(bot_pos, pos)
             if d < best_dist:
                 best_dist = d
                 best = pos
@@ -267,17 +575,14 @@ class BotPlayer:
         return best
 
     def _stuck_escape_move(self, controller, bot_id, bot_pos, dist_map, blocked_tiles):
+        # Fixed escape order (cluster, shop, submit) keeps recovery deterministic.
         target = self._pick_cluster_target(
             self.largest_ingredient_cluster, bot_pos, dist_map)
-        candidates = []
-        if target:
-            candidates.append(target)
-        if self.shop_loc:
-            candidates.append(self.shop_loc)
-        if self.submit_loc:
-            candidates.append(self.submit_loc)
-        for tx, ty in candidates:
-            if dist_map is not None and not self._has_access(dist_map, (tx, ty)):
+        for candidate in (target, self.shop_loc, self.submit_loc):
+            if not candidate:
+                continue
+            tx, ty = candidate
+            if dist_map is not None and not self._has_access(dist_map, candidate):
                 continue
             step = self.get_next_step_astar(
                 controller, bot_pos, tx, ty, blocked=blocked_tiles)
@@ -291,48 +596,42 @@ class BotPlayer:
     def _nearest_idle_safe_tile(self, bot_pos, dist_map, blocked_tiles):
         if not self.cached_map:
             return None
-        m = self.cached_map
+        h = self.height
+        bx, by = bot_pos
+        critical = self.critical_tiles
         best = None
         best_dist = 9999
-        for x in range(m.width):
-            for y in range(m.height):
-                if not m.is_tile_walkable(x, y):
-                    continue
-                pos = (x, y)
-                if pos in self.critical_tiles:
-                    continue
-                if blocked_tiles and pos in blocked_tiles:
+        for i, walkable in enumerate(self.walkable):
+            if not walkable:
+                continue
+            # Walkable tiles read the flat map directly (unreached stays
+            # >= 9999), so losing tiles are dropped before decoding (x, y).
+            if dist_map is not None:
+                d = dist_map[i]
+                if d >= best_dist:
                     continue
-                if dist_map is not None:
-                    d = self._distance_to_tile(dist_map, pos)
-                else:
-                    d = self._chebyshev(bot_pos, pos)
-                if d < best_dist:
-                    best_dist = d
-                    best = pos
+                pos = divmod(i, h)
+            else:
+                pos = divmod(i, h)
+                d = max(abs(pos[0] - bx), abs(pos[1] - by))
+            if pos in critical:
+                continue
+            if blocked_tiles and pos in blocked_tiles:
+                continue
+            if d < best_dist:
+                best_dist = d
+                best = pos
         if dist_map is not None and best_dist >= 9999:
             return None
         return best
 
     def _pick_proactive_idle_target(self, controller, bot_id, state, dist_map):
         # Proactively drift toward the next likely work area when idle.
-        orders = controller.get_orders(controller.get_team())
-        turn = controller.get_turn()
-        team_money = controller.get_team_money(controller.get_team())
-        best = None
-        best_score = -float('inf')
-        for o in orders:
-            if not o['is_active'] or o['expires_turn'] <= turn:
-                continue
-            score = self.calculate_order_heuristic(
-                controller, bot_id, state, o, turn, team_money, self.HEURISTIC_INGREDIENTS)
-            if score > best_score:
-                best_score = score
-                best = o
+        best = self._best_order(
+            controller, bot_id, state, self._turn, self.HEURISTIC_INGREDIENTS)
         if not best:
             return None
-        needs_cook = any(self.needs_cooking(i)
-                         for i in best.get('required', []))
+        needs_cook = not _NEEDS_COOKING.isdisjoint(best.get('required', []))
         if needs_cook and self.cookers:
             target = self.cooker_priority[0] if self.cooker_priority else self.cookers[0]
         else:
@@ -390,17 +689,15 @@ class BotPlayer:
     def _assist_target_active(self, controller, state):
         if not state.assist_order_id or not state.assist_item:
             return False
-        orders = controller.get_orders(controller.get_team())
-        order = next(
-            (o for o in orders if o['order_id'] == state.assist_order_id), None)
-        if not order or not order['is_active'] or order['expires_turn'] <= controller.get_turn():
+        order = self._active_order(controller, state.assist_order_id)
+        if not order:
             return False
         if state.assist_item not in order.get('required', []):
             return False
         return True
 
     def _assign_endgame_assist(self, controller, bots):
-        turns_left = GameConstants.TOTAL_TURNS - controller.get_turn()
+        turns_left = GameConstants.TOTAL_TURNS - self._turn
         if turns_left > self.ENDGAME_ASSIST_TURNS:
             for bid in bots:
                 st = self.bot_states.get(bid)
@@ -439,62 +736,152 @@ class BotPlayer:
             if st:
                 self._clear_assist_state(st)
 
-    def get_next_step_astar(self, controller, start, target_x, target_y, blocked=None):
-        # Get next step towards target using A* with Manhattan heuristic. Returns (dx, dy) or None.
-        if blocked is None:
-            blocked = set()
+    def _build_step_table(self, target):
+        return _reverse_bfs(self.walkable, self.width, self.height,
+                            target[0], target[1], self.adjacency)
 
+    def _get_step_table(self, target):
+        table = self.step_tables.get(target)
+        if table is None:
+            table = self._build_step_table(target)
+            self.step_tables[target] = table
+        return table
+
+    def get_next_step_astar(self, controller, start, target_x, target_y, blocked=None):
+        # Next step towards target as (dx, dy), or None if unreachable. Targets
+        # the step table cannot reach are rejected first; otherwise the result
+        # comes from the route cache or, on a miss, the Manhattan A*.
+        blocked = blocked or _NO_TILES
         bx, by = start
         # Already adjacent?
-        if max(abs(bx - target_x), abs(by - target_y)) <= 1:
+        if -1 <= bx - target_x <= 1 and -1 <= by - target_y <= 1:
             return (0, 0)
 
-        m = controller.get_map(controller.get_team())
+        # A target the step table cannot reach is unreachable whatever the
+        # blocked tiles; skip the search, which would flood the whole region.
+        if self.walkable is not None:
+            step = self._get_step_table((target_x, target_y))[1]
+            if step[bx * self.height + by] < 0:
+                return None
+        key = (start, target_x, target_y, frozenset(blocked))
+        cache = self._route_cache
+        if key in cache:
+            # Re-insert so the oldest entry is always the least recently used.
+            result = cache.pop(key)
+            cache[key] = result
+            return result
+        result = self._astar_step(controller, start, target_x, target_y, blocked)
+        if len(cache) >= _ROUTE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = result
+        return result
+
+    def _reachable(self, controller, start, target, blocked=None):
+        # Reachability probe: a connected-component check, searching only when
+        # other bots might cut the route.
+        bx, by = start
+        tx, ty = target
+        if -1 <= bx - tx <= 1 and -1 <= by - ty <= 1:
+            return True
+        if self.walkable is None:
+            return self.get_next_step_astar(controller, start, tx, ty, blocked) is not None
+        # Static reachability: the target must border the start's component.
+        h = self.height
+        if 0 <= tx < self.width and 0 <= ty < h:
+            component = self.component
+            comp = component[bx * h + by]
+            if comp < 0 or all(component[j] != comp for j in self.access[tx * h + ty]):
+                return False
+        elif self._get_step_table(target)[1][bx * h + by] < 0:
+            return False
+        if not blocked:
+            return True
+        return self.get_next_step_astar(controller, start, tx, ty, blocked) is not None
+
+    def _reaches_around(self, start, target_x, target_y, blocked):
+        # Flat BFS from start with the blocked tiles as walls: True once it
+        # gets within one step of the target. Cheaper than letting the A*
+        # sweep a region the target cannot be reached from.
+        if self.walkable is None:
+            return True
+        w, h = self.width, self.height
+        free = bytearray(self.walkable)
+        for x, y in blocked:
+            if 0 <= x < w and 0 <= y < h:
+                free[x * h + y] = 0
+        adjacency = self.adjacency
+        src = start[0] * h + start[1]
+        free[src] = 0
+        frontier = [src]
+        while frontier:
+            nxt = []
+            for i in frontier:
+                cx, cy = divmod(i, h)
+                if -1 <= cx - target_x <= 1 and -1 <= cy - target_y <= 1:
+                    return True
+                for j, _ in adjacency[i]:
+                    if free[j]:
+                        free[j] = 0
+                        nxt.append(j)
+            frontier = nxt
+        return False
 
-        # Priority queue: (f_score, g_score, x, y, first_step)
-        open_set = []
-        heapq.heappush(open_set, (0, 0, bx, by, None))
+    def _astar_step(self, controller, start, target_x, target_y, blocked):
+        # A* with Manhattan heuristic over the cached map. The heuristic
+        # over-costs diagonals, so routes are not always shortest; the bot's
+        # play is tuned to them, so they are kept.
+        bx, by = start
+        if -1 <= bx - target_x <= 1 and -1 <= by - target_y <= 1:
+            return (0, 0)
 
-        # Cost from start to node
-        g_scores = {(bx, by): 0}
+        if self.walkable is not None:
+            width, height, adjacency = self.width, self.height, self.adjacency
+        else:
+            m = self.cached_map or controller.get_map(self._team)
+            width, height = m.width, m.height
+            walkable = bytes(m.is_tile_walkable(x, y)
+                             for x in range(width) for y in range(height))
+            adjacency = _build_adjacency(walkable, width, height)
+        # Heap entries are (f, g, tile, first step code). Flat tiles and step
+        # codes sort like (x, y) and (dx, dy), so ties go to the lowest tile,
+        # then the lowest first step. The start has no first step (-1).
+        src = bx * height + by
+        open_set = [(0, 0, src, -1)]
+        # Cost from start to node, flat-indexed (65535 = not seen yet). Blocked
+        # tiles hold 0 so the cost test alone skips them; walls are not in the
+        # adjacency at all.
+        g_scores = array('H', [65535]) * (width * height)
+        for x, y in blocked:
+            if 0 <= x < width and 0 <= y < height:
+                g_scores[x * height + y] = 0
+        g_scores[src] = 0
+        budget = max(_SEARCH_MIN_BUDGET, _SEARCH_BUDGET_PER_STEP *
+                     max(abs(bx - target_x), abs(by - target_y)))
+        heappush, heappop = heapq.heappush, heapq.heappop
 
         while open_set:
-            _, g, cx, cy, first_step = heapq.heappop(open_set)
+            _, g, i, first = heappop(open_set)
+            # Stale entry: the tile was re-queued with a shorter path.
+            if g > g_scores[i]:
+                continue
+            budget -= 1
+            if budget == 0 and not self._reaches_around(start, target_x, target_y, blocked):
+                return None
 
             # If we are adjacent to target, we found the path
-            if max(abs(cx - target_x), abs(cy - target_y)) <= 1:
-                return first_step
-
-            # Check neighbors
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-
-                    nx, ny = cx + dx, cy + dy
-
-                    # Bounds check
-                    if not (0 <= nx < m.width and 0 <= ny < m.height):
-                        continue
-
-                    # Walkability check
-                    if not m.is_tile_walkable(nx, ny):
-                        continue
-
-                    # Blocked check
-                    if (nx, ny) in blocked:
-                        continue
-
-                    new_g = g + 1
+            cx, cy = divmod(i, height)
+            if -1 <= cx - target_x <= 1 and -1 <= cy - target_y <= 1:
+                return _STEP_DIRS[first] if first >= 0 else None
 
-                    if (nx, ny) not in g_scores or new_g < g_scores[(nx, ny)]:
-                        g_scores[(nx, ny)] = new_g
-                        # Manhattan heuristic
-                        h = abs(nx - target_x) + abs(ny - target_y)
-                        f = new_g + h
-
-                        step = first_step if first_step else (dx, dy)
-                        heapq.heappush(open_set, (f, new_g, nx, ny, step))
+            new_g = g + 1
+            for j, back in adjacency[i]:
+                if new_g >= g_scores[j]:
+                    continue
+                g_scores[j] = new_g
+                # Manhattan heuristic
+                nx, ny = divmod(j, height)
+                f = new_g + abs(nx - target_x) + abs(ny - target_y)
+                heappush(open_set, (f, new_g, j, first if first >= 0 else 8 - back))
 
         return None
 
@@ -503,7 +890,7 @@ class BotPlayer:
         state = controller.get_bot_state(bot_id)
         bx, by = state['x'], state['y']
 
-        if max(abs(bx - target_x), abs(by - target_y)) <= 1:
+        if -1 <= bx - target_x <= 1 and -1 <= by - target_y <= 1:
             return True
 
         step = self.get_next_step_astar(
@@ -523,134 +910,233 @@ class BotPlayer:
             return self._distance_to_tile(self.dist_from_counters, from_pos)
         if target_pos in (self.shops or []) and self.dist_from_shop is not None:
             return self._distance_to_tile(self.dist_from_shop, from_pos)
-        return self._chebyshev(from_pos, target_pos)
+        return _chebyshev(from_pos, target_pos)
 
     def get_free_counter(self, controller, exclude=None, bot_pos=None, blocked_tiles=None,
-                         anchor_pos=None, zone_anchor=None, next_target=None, bot_dist_map=None):
+                         anchor_pos=None, zone_anchor=None, next_target=None, bot_dist_map=None,
+                         extra_exclude=None):
         # Find empty counter that is reachable and closest to the shop, then bot.
+        # extra_exclude is one more counter to skip, so callers can pass a
+        # shared exclude set without copying it.
         if exclude is None:
-            exclude = set()
-
-        def dist_bot(counter_pos):
-            if bot_dist_map is not None:
-                return self._distance_to_tile(bot_dist_map, counter_pos)
-            if bot_pos is not None:
-                return self._chebyshev(counter_pos, bot_pos)
-            return 0
-
-        def dist_shop(counter_pos):
-            if self.dist_from_shop is not None:
-                return self._distance_to_tile(self.dist_from_shop, counter_pos)
-            if self.shop_loc:
-                return self._chebyshev(counter_pos, self.shop_loc)
-            return 0
+            exclude = _NO_TILES
 
         counters = self.counters or []
-        candidates = []
-
-        for cx, cy in counters:
-            if (cx, cy) in exclude:
+        shop_dists = self.counter_shop_dists
+        best = None
+        best_fallback = None
+        # With other bots in the way, one flood fill around them answers every
+        # counter's reachability probe (instead of a detour search per counter).
+        reach = None
+        if bot_dist_map is None and bot_pos is not None and blocked_tiles and self.walkable is not None:
+            reach = self._flood_around(bot_pos, blocked_tiles)
+
+        # Counters come in static shop-distance order, so once an empty one is
+        # found only its shop-distance ties can still beat it.
+        for idx in self.counters_by_shop:
+            if best is not None and shop_dists[idx] > best[0]:
+                break
+            cx, cy = counters[idx]
+            if (cx, cy) in exclude or (cx, cy) == extra_exclude:
                 continue
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if not tile or tile.item is not None:
+            if bot_dist_map is not None:
+                d_bot = self._distance_to_tile(bot_dist_map, (cx, cy))
+                if d_bot >= 9999:
+                    continue
+            elif bot_pos is not None:
+                d_bot = _chebyshev((cx, cy), bot_pos)
+                if reach is not None:
+                    if not self._flood_reaches(reach, cx, cy):
+                        continue
+                elif not self._reachable(controller, bot_pos, (cx, cy), blocked_tiles):
+                    continue
+            else:
+                d_bot = 0
+            entry = (shop_dists[idx], d_bot, (cx, cy))
+            if best_fallback is None or entry < best_fallback:
+                best_fallback = entry
+            if best is not None and entry >= best:
                 continue
-            reachable = True
-            if bot_pos or bot_dist_map is not None:
-                if bot_dist_map is not None:
-                    reachable = dist_bot((cx, cy)) < 9999
-                else:
-                    step = self.get_next_step_astar(
-                        controller, bot_pos, cx, cy, blocked=blocked_tiles)
-                    reachable = step is not None
-            if reachable:
-                candidates.append(
-                    (dist_shop((cx, cy)), dist_bot((cx, cy)), (cx, cy)))
+            tile = self._tile(controller, cx, cy)
+            if tile and tile.item is None:
+                best = entry
 
-        if candidates:
-            candidates.sort()
-            return candidates[0][2]
+        if best is not None:
+            return best[2]
 
         # Fallback: any counter not in exclude, preferring reachable ones
-        fallback = []
-        for cx, cy in counters:
-            if (cx, cy) in exclude:
-                continue
-            reachable = True
-            if bot_pos or bot_dist_map is not None:
-                if bot_dist_map is not None:
-                    reachable = dist_bot((cx, cy)) < 9999
-                else:
-                    step = self.get_next_step_astar(
-                        controller, bot_pos, cx, cy, blocked=blocked_tiles)
-                    reachable = step is not None
-            if reachable:
-                fallback.append(
-                    (dist_shop((cx, cy)), dist_bot((cx, cy)), (cx, cy)))
-        if fallback:
-            fallback.sort()
-            return fallback[0][2]
+        if best_fallback is not None:
+            return best_fallback[2]
 
         # Last resort: just return first counter
         return self.counters[0] if self.counters else None
 
-    def get_free_cooker(self, controller):
-        # Find cooker with empty pan.
+    def _flood_around(self, start, blocked):
+        # Flat BFS distances from start, treating blocked tiles as walls.
+        w, h = self.width, self.height
+        blocked_idx = {x * h + y for x, y in blocked if 0 <= x < w and 0 <= y < h}
+        return _flood_fill(self.walkable, w, h, (start,), self.adjacency, blocked_idx)
+
+    def _flood_reaches(self, dist, x, y):
+        # True if the flood reached a tile within one step of (x, y).
+        w, h = self.width, self.height
+        for dx, dy in _STEP_DIRS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h and dist[nx * h + ny] != _UNREACHABLE:
+                return True
+        return False
+
+    def _tile(self, controller, x, y):
+        # Memoized get_tile (the controller deep-copies every tile). Cleared
+        # whenever a bot may have changed the board.
+        key = (x, y)
+        tile = self._tile_cache.get(key)
+        if tile is None:
+            tile = controller.get_tile(self._team, x, y)
+            self._tile_cache[key] = tile
+        return tile
+
+    def _bot_state(self, controller, bot_id):
+        # Only the acting bot changes during its run, so every other bot's
+        # state is read once per turn (or once after its own run).
+        if bot_id == self._acting_bot:
+            return controller.get_bot_state(bot_id)
+        info = self._bot_info.get(bot_id)
+        if info is None:
+            info = controller.get_bot_state(bot_id)
+            self._bot_info[bot_id] = info
+        return info
+
+    def _start_turn_tiles(self, controller):
+        # Our bots' actions forget their tiles as they happen, so between our
+        # turns only the environment ticks (cookers, sinks) change the board.
+        if not self._maps_switched:
+            info = controller.get_switch_info()
+            self._maps_switched = info['my_team_switched'] or info['enemy_team_switched']
+        if self._maps_switched:
+            self._clear_tile_cache()
+            return
+        cache = self._tile_cache
+        for pos in self.ticking_tiles:
+            cache.pop(pos, None)
+        self._ingredient_index = None
+        self._box_index = None
+
+    def _clear_tile_cache(self):
+        self._tile_cache.clear()
+        self._ingredient_index = None
+        self._box_index = None
+
+    def _forget_tile(self, x, y):
+        # Called by every action wrapper with the tile it acted on.
+        self._tile_cache.pop((x, y), None)
+        self._ingredient_index = None
+        self._box_index = None
+
+    def _index_stations(self, controller):
+        # One pass over counters and cookers, shared by the lookups below
+        # until the tile cache is next cleared.
+        if self._ingredient_index is not None:
+            return
+        index = {}
+        free_cookers = []
+        panless_cookers = []
+        # (pos, food_name, cooked_stage) for every pan holding food.
+        busy_pans = []
+        # pos -> (has_pan, food_name, cooked_stage)
+        cooker_state = {}
+        counter_plates = []
+        # Food names on counters, loose or plated, in counter order.
+        counter_foods = []
+        plated_foods = []
+        tile_at = self._tile
+        for cx, cy in self.counters:
+            tile = tile_at(controller, cx, cy)
+            item = tile.item if tile else None
+            if item is None:
+                continue
+            if type(item) is Food:
+                index.setdefault(item.food_name, []).append(((cx, cy), False))
+                counter_foods.append(item.food_name)
+            elif type(item) is Plate:
+                counter_plates.append((cx, cy))
+                names = [f.food_name for f in item.food]
+                counter_foods.extend(names)
+                plated_foods.extend(names)
         for kx, ky in self.cookers:
-            tile = controller.get_tile(controller.get_team(), kx, ky)
-            if tile and isinstance(tile.item, Pan) and tile.item.food is None:
-                return (kx, ky)
-        return None
+            tile = tile_at(controller, kx, ky)
+            if not tile:
+                continue
+            item = tile.item
+            if type(item) is not Pan:
+                panless_cookers.append((kx, ky))
+                cooker_state[(kx, ky)] = (False, None, 0)
+            elif item.food is None:
+                free_cookers.append((kx, ky))
+                cooker_state[(kx, ky)] = (True, None, 0)
+            else:
+                food = item.food
+                index.setdefault(food.food_name, []).append(((kx, ky), True))
+                busy_pans.append(((kx, ky), food.food_name, food.cooked_stage))
+                cooker_state[(kx, ky)] = (True, food.food_name, food.cooked_stage)
+        self._ingredient_index = index
+        self._free_cookers = free_cookers
+        self._panless_cookers = panless_cookers
+        self._busy_pans = busy_pans
+        self._cooker_state = cooker_state
+        self._counter_plates = counter_plates
+        self._counter_foods = counter_foods
+        self._plated_foods = plated_foods
+
+    def get_busy_pans(self, controller):
+        # Pans with food in them, as (pos, food_name, cooked_stage).
+        self._index_stations(controller)
+        return self._busy_pans
 
-    def _chebyshev(self, a, b):
-        return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
-
-    def _tile_base_char(self, tile_name):
-        return {
-            "WALL": "#",
-            "FLOOR": ".",
-            "COUNTER": "C",
-            "COOKER": "K",
-            "SINK": "S",
-            "SINKTABLE": "T",
-            "TRASH": "R",
-            "SUBMIT": "U",
-            "SHOP": "$",
-            "BOX": "B",
-        }.get(tile_name, "?")
+    def get_free_cooker(self, controller):
+        # Find cooker with empty pan.
+        self._index_stations(controller)
+        return self._free_cookers[0] if self._free_cookers else None
 
     def _tile_item_char(self, tile):
         item = getattr(tile, "item", None)
-        if isinstance(item, Food):
+        if type(item) is Food:
             return item.food_name[0].lower()
-        if isinstance(item, Plate):
+        if type(item) is Plate:
             return "P"
-        if isinstance(item, Pan):
+        if type(item) is Pan:
             if item.food:
                 return item.food.food_name[0].upper()
             return "k"
         return None
 
     def debug_print_board(self, controller):
-        if not self.cached_map:
+        if not self.debug_board or not self.cached_map:
             return
         m = self.cached_map
+        tile_at = self._tile
+        item_char = self._tile_item_char
         rows = []
         for y in range(m.height - 1, -1, -1):
             row = []
             for x in range(m.width):
-                tile = controller.get_tile(controller.get_team(), x, y)
-                base = self._tile_base_char(tile.tile_name) if tile else "?"
-                item = self._tile_item_char(tile)
-                row.append(item if item else base)
+                tile = tile_at(controller, x, y)
+                item = item_char(tile)
+                if item:
+                    row.append(item)
+                else:
+                    row.append(_TILE_CHARS.get(tile.tile_name, "?") if tile else "?")
             rows.append("".join(row))
         print("[BOARD]")
         for r in rows:
             print(r)
 
     def debug_print_bots(self, controller, bots):
+        if not self.debug_board:
+            return
         parts = []
         for bid in bots:
-            info = controller.get_bot_state(bid)
+            info = self._bot_state(controller, bid)
             holding = info.get('holding')
             held = None
             if holding:
@@ -667,15 +1153,14 @@ class BotPlayer:
         if not loc or not self.cached_map:
             return []
         x, y = loc
-        m = self.cached_map
+        w, h = self.width, self.height
+        walkable = self.walkable
         out = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if not m.in_bounds(nx, ny):
-                    continue
-                if m.is_tile_walkable(nx, ny):
-                    out.append((nx, ny))
+        # Includes loc itself, matching the (0, 0) entry of _STEP_DIRS.
+        for dx, dy in _STEP_DIRS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h and walkable[nx * h + ny]:
+                out.append((nx, ny))
         return out
 
     def _adjacent_walkables_multi(self, locs):
@@ -687,44 +1172,31 @@ class BotPlayer:
     def _build_dist_map(self, sources):
         if not self.cached_map or not sources:
             return None
-        m = self.cached_map
-        dist = [[None for _ in range(m.height)] for _ in range(m.width)]
-        q = deque()
-        for sx, sy in sources:
-            if not m.in_bounds(sx, sy) or not m.is_tile_walkable(sx, sy):
-                continue
-            if dist[sx][sy] is None:
-                dist[sx][sy] = 0
-                q.append((sx, sy))
-        while q:
-            cx, cy = q.popleft()
-            base = dist[cx][cy]
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx, ny = cx + dx, cy + dy
-                    if not m.in_bounds(nx, ny) or not m.is_tile_walkable(nx, ny):
-                        continue
-                    if dist[nx][ny] is None:
-                        dist[nx][ny] = base + 1
-                        q.append((nx, ny))
-        return dist
+        # Flat array('h') indexed x * height + y, _UNREACHABLE where no path.
+        return _flood_fill(self.walkable, self.width, self.height, sources, self.adjacency)
 
     def _distance_to_tile(self, dist_map, tile_pos):
         if not dist_map or not self.cached_map or not tile_pos:
             return 9999
-        m = self.cached_map
         x, y = tile_pos
-        if m.in_bounds(x, y) and m.is_tile_walkable(x, y):
-            d = dist_map[x][y]
-            return d if d is not None else 9999
-        best = 9999
-        for nx, ny in self._adjacent_walkables(tile_pos):
-            d = dist_map[nx][ny]
-            if d is not None and d < best:
-                best = d
-        return best
+        h = self.height
+        w = self.width
+        if 0 <= x < w and 0 <= y < h:
+            # Stations are reached from any walkable neighbour.
+            best = _UNREACHABLE
+            for j in self.access[x * h + y]:
+                d = dist_map[j]
+                if d < best:
+                    best = d
+            return best if best != _UNREACHABLE else 9999
+        best = _UNREACHABLE
+        for dx, dy in _STEP_DIRS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h:
+                d = dist_map[nx * h + ny]
+                if d < best:
+                    best = d
+        return best if best != _UNREACHABLE else 9999
 
     def _compute_expiry_safety_buffer(self):
         # Conservative buffer based on map size and obstacle density.
@@ -734,11 +1206,7 @@ class BotPlayer:
         area = m.width * m.height
         if area <= 0:
             return 3
-        walkable = 0
-        for x in range(m.width):
-            for y in range(m.height):
-                if m.is_tile_walkable(x, y):
-                    walkable += 1
+        walkable = sum(self.walkable)
         complexity = 1.0 - (walkable / area)
         size_buffer = max(2, int(area * 0.02))
         complexity_buffer = int(area * complexity * 0.05)
@@ -751,7 +1219,7 @@ class BotPlayer:
         best_dist = 9999
         for sx, sy in self.shops:
             d = self._distance_to_tile(
-                dist_map, (sx, sy)) if dist_map else self._chebyshev(bot_pos, (sx, sy))
+                dist_map, (sx, sy)) if dist_map else _chebyshev(bot_pos, (sx, sy))
             if d < best_dist:
                 best_dist = d
                 best = (sx, sy)
@@ -766,7 +1234,7 @@ class BotPlayer:
         for c in self.counters:
             if bot_dist_map is not None and self._distance_to_tile(bot_dist_map, c) >= 9999:
                 continue
-            score = self._chebyshev(bot_pos, c)
+            score = _chebyshev(bot_pos, c)
             if self.dist_from_shop is not None:
                 score += self._distance_to_tile(self.dist_from_shop, c)
             if self.dist_from_submit is not None:
@@ -778,9 +1246,31 @@ class BotPlayer:
                 best = c
         return best
 
+    def _component_reach(self, start):
+        # Same answer as _has_access on the unblocked map from start: a tile
+        # is usable if any of its standing tiles shares start's component.
+        h = self.height
+        comp = self.component[start[0] * h + start[1]]
+        reach = self.component_reach.get(comp)
+        if reach is None:
+            component = self.component
+            reach = frozenset(
+                divmod(i, h) for i, tiles in enumerate(self.access)
+                if comp >= 0 and any(component[j] == comp for j in tiles))
+            self.component_reach[comp] = reach
+        return reach
+
     def _has_access(self, dist_map, target_pos):
         if not dist_map or not target_pos:
             return False
+        x, y = target_pos
+        h = self.height
+        if self.cached_map and 0 <= x < self.width and 0 <= y < h:
+            # Stop at the first reached standing tile.
+            for j in self.access[x * h + y]:
+                if dist_map[j] != _UNREACHABLE:
+                    return True
+            return False
         return self._distance_to_tile(dist_map, target_pos) < 9999
 
     def _is_helper_mode(self, dist_map):
@@ -789,64 +1279,65 @@ class BotPlayer:
 
     def _others_can_access_cookers(self, other_dist_maps):
         for dm in other_dist_maps or []:
-            if any(self._has_access(dm, c) for c in self.cookers or []):
+            if self._can_access_any_cooker(dm):
                 return True
         return False
 
     def _can_access_any_cooker(self, dist_map):
-        return any(self._has_access(dist_map, c) for c in self.cookers or [])
+        if not dist_map or not self.cached_map:
+            return False
+        return any(dist_map[j] != _UNREACHABLE for j in self.cooker_access)
 
     def _can_access_any_shop(self, dist_map):
-        if not dist_map or not self.shops:
+        if not dist_map or not self.cached_map:
             return False
-        return any(self._has_access(dist_map, s) for s in self.shops)
+        return any(dist_map[j] != _UNREACHABLE for j in self.shop_access)
 
     def _find_handoff_food(self, controller, dist_map, require_cookable=True, require_raw=False, require_cooked=False, item_name=None):
         counters = self.shared_handoff_counters or self.counters or []
         for cx, cy in counters:
             if dist_map and not self._has_access(dist_map, (cx, cy)):
                 continue
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if tile and isinstance(tile.item, Food):
-                if require_cookable and not tile.item.can_cook:
-                    continue
-                if require_raw and tile.item.cooked_stage != 0:
-                    continue
-                if require_cooked and tile.item.cooked_stage != 1:
-                    continue
-                if item_name and tile.item.food_name != item_name:
-                    continue
-                return (cx, cy)
+            tile = self._tile(controller, cx, cy)
+            item = tile.item if tile else None
+            if item is None or type(item) is not Food:
+                continue
+            if require_cookable and not item.can_cook:
+                continue
+            if require_raw and item.cooked_stage != 0:
+                continue
+            if require_cooked and item.cooked_stage != 1:
+                continue
+            if item_name and item.food_name != item_name:
+                continue
+            return (cx, cy)
         return None
 
     def _find_handoff_counter(self, controller, dist_map, other_dist_maps):
         if not dist_map:
             return None
+        # One pass: nearest empty counter reachable by both bots, with the
+        # nearest one reachable by this bot alone as the fallback.
+        best_shared = None
+        best_shared_dist = 9999
         best = None
         best_dist = 9999
         counters = self.shared_handoff_counters or self.counters or []
-        shared = []
         for cx, cy in counters:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if not tile or tile.item is not None:
-                continue
-            if self._distance_to_tile(dist_map, (cx, cy)) >= 9999:
-                continue
-            if any(self._distance_to_tile(odm, (cx, cy)) < 9999 for odm in other_dist_maps):
-                shared.append((cx, cy))
-
-        # Prefer counters reachable by both bots; otherwise fall back to any reachable.
-        candidates = shared if shared else [
-            c for c in counters if self._distance_to_tile(dist_map, c) < 9999]
-        for cx, cy in candidates:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
+            tile = self._tile(controller, cx, cy)
             if not tile or tile.item is not None:
                 continue
             d = self._distance_to_tile(dist_map, (cx, cy))
+            if d >= 9999:
+                continue
             if d < best_dist:
                 best_dist = d
                 best = (cx, cy)
-        return best
+            if d < best_shared_dist and any(
+                    self._distance_to_tile(odm, (cx, cy)) < 9999 for odm in other_dist_maps):
+                best_shared_dist = d
+                best_shared = (cx, cy)
+        return best_shared if best_shared is not None else best
 
     def _attempt_handoff(self, controller, bot_id, state, dist_map, other_dist_maps, blocked_tiles, order_id_override=None, item_name_override=None):
         info = controller.get_bot_state(bot_id)
@@ -864,14 +1355,15 @@ class BotPlayer:
             return False
         cx, cy = counter
         if self.move_to(controller, bot_id, cx, cy, blocked_tiles):
-            if controller.place(bot_id, cx, cy):
+            if self._act(controller.place, bot_id, cx, cy):
                 held_type = holding.get('type')
                 held_name = holding.get(
                     'food_name') if held_type == 'Food' else None
                 handoff_item = item_name_override or held_name
                 order_id = order_id_override
-                print(
-                    f"[Bot {bot_id}] Handoff placed at ({cx},{cy}) item={held_type}:{held_name}")
+                if self.debug_board:
+                    print(
+                        f"[Bot {bot_id}] Handoff placed at ({cx},{cy}) item={held_type}:{held_name}")
                 if state.current_order:
                     order_id = state.current_order['order_id']
                     self.add_pending_order(
@@ -893,9 +1385,9 @@ class BotPlayer:
                 self.handoff_happened_turn = True
                 return True
             if self.debug_board:
-                tile = controller.get_tile(controller.get_team(), cx, cy)
+                tile = self._tile(controller, cx, cy)
                 tile_item = getattr(tile, "item", None)
-                if isinstance(tile_item, Food):
+                if type(tile_item) is Food:
                     item_desc = f"{tile_item.food_name}:{tile_item.cooked_stage}"
                 else:
                     item_desc = type(
@@ -907,58 +1399,33 @@ class BotPlayer:
                 f"[Bot {bot_id}] Handoff move toward ({cx},{cy}) blocked")
         return False
 
-    def _location_score(self, pos):
-        # Lower score is better (more central to weighted landmarks).
-        if not self.landmarks:
-            return 0
-        score = 0
-        for loc, weight in self.landmarks:
-            if loc == self.shop_loc and self.dist_from_shop is not None:
-                dist = self._distance_to_tile(self.dist_from_shop, pos)
-            elif loc == self.submit_loc and self.dist_from_submit is not None:
-                dist = self._distance_to_tile(self.dist_from_submit, pos)
-            else:
-                dist = self._distance_to_tile(self.dist_from_counters, pos)
-            score += weight * dist
-        return score
-
-    def _location_score(self, pos):
-        # Lower score is better (more central to weighted landmarks).
-        if not self.landmarks:
-            return 0
-        return sum(weight * self._chebyshev(pos, loc) for loc, weight in self.landmarks)
-
     def choose_cooker(self, controller, anchor_pos=None, bot_pos=None, blocked_tiles=None,
                       want_food=False, reserved_cookers=None, allow_reserved=None):
         # Pick a cooker closest to the shop; tie-break by bot position.
         best = None
         best_dist = (float('inf'), float('inf'))
 
-        for kx, ky in self.cooker_priority:
-            tile = controller.get_tile(controller.get_team(), kx, ky)
-            if not tile or not isinstance(tile.item, Pan):
+        self._index_stations(controller)
+        cooker_state = self._cooker_state
+        for dist_shop, (kx, ky) in zip(self.cooker_scores, self.cooker_priority):
+            # Sorted by shop distance, so nothing later can win outright.
+            if dist_shop > best_dist[0]:
+                break
+            st = cooker_state.get((kx, ky))
+            if not st or not st[0]:
                 continue
             if reserved_cookers and (kx, ky) in reserved_cookers and (allow_reserved is None or (kx, ky) != allow_reserved):
                 continue
-            if want_food and tile.item.food is None:
+            if want_food and st[1] is None:
                 continue
-            if not want_food and tile.item.food is not None:
+            if not want_food and st[1] is not None:
                 continue
 
             if bot_pos:
-                step = self.get_next_step_astar(
-                    controller, bot_pos, kx, ky, blocked=blocked_tiles)
-                if step is None:
+                if not self._reachable(controller, bot_pos, (kx, ky), blocked_tiles):
                     continue
 
-            if self.dist_from_shop is not None:
-                dist_shop = self._distance_to_tile(
-                    self.dist_from_shop, (kx, ky))
-            elif self.shop_loc:
-                dist_shop = self._chebyshev((kx, ky), self.shop_loc)
-            else:
-                dist_shop = 0
-            dist_bot = self._chebyshev((kx, ky), bot_pos) if bot_pos else 0
+            dist_bot = _chebyshev((kx, ky), bot_pos) if bot_pos else 0
             dist = (dist_shop, dist_bot)
 
             if dist < best_dist:
@@ -969,87 +1436,49 @@ class BotPlayer:
 
     def get_cooker_needing_pan(self, controller):
         # Find cooker without pan.
-        for kx, ky in self.cookers:
-            tile = controller.get_tile(controller.get_team(), kx, ky)
-            if tile and not isinstance(tile.item, Pan):
-                return (kx, ky)
-        return None
-
-    def needs_cooking(self, ing):
-        return ing in ('EGG', 'MEAT')
-
-    def needs_chopping(self, ing):
-        return ing in ('MEAT', 'ONIONS')
-
-    def get_food_type(self, name):
-        return {'EGG': FoodType.EGG, 'MEAT': FoodType.MEAT, 'NOODLES': FoodType.NOODLES,
-                'ONIONS': FoodType.ONIONS, 'SAUCE': FoodType.SAUCE}.get(name)
+        self._index_stations(controller)
+        return self._panless_cookers[0] if self._panless_cookers else None
 
     def find_existing_ingredient(self, controller, ingredient):
-        # Find partial matching ingredient on map.
-        # Check counters for chopped/raw version
-        for cx, cy in self.counters:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if tile and isinstance(tile.item, Food) and tile.item.food_name == ingredient:
-                return (cx, cy), False  # False = not cooking
-
-        # Check cookers for cooking version
-        for kx, ky in self.cookers:
-            tile = controller.get_tile(controller.get_team(), kx, ky)
-            if tile and isinstance(tile.item, Pan) and tile.item.food and tile.item.food.food_name == ingredient:
-                return (kx, ky), True  # True = is cooking
+        # Find partial matching ingredient on map: counters (raw/chopped)
+        # are indexed before cookers (cooking), so the first hit wins.
+        self._index_stations(controller)
+        hits = self._ingredient_index.get(ingredient)
+        if hits:
+            return hits[0]
         return None, False
 
     def find_box_with_ingredient(self, controller, ingredient):
         # Only use boxes as a fallback source.
-        for bx, by in self.boxes or []:
-            tile = controller.get_tile(controller.get_team(), bx, by)
-            if not tile or tile.item is None:
-                continue
-            if isinstance(tile.item, Food) and tile.item.food_name == ingredient:
-                return (bx, by)
-        return None
+        if self._box_index is None:
+            box_index = {}
+            for bx, by in self.boxes or []:
+                tile = self._tile(controller, bx, by)
+                item = tile.item if tile else None
+                if type(item) is Food:
+                    box_index.setdefault(item.food_name, (bx, by))
+            self._box_index = box_index
+        return self._box_index.get(ingredient)
 
     def get_world_inventory(self, controller):
-        inventory = []
-        # Counters and plates on counters
-        for cx, cy in self.counters or []:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if not tile:
-                continue
-            if isinstance(tile.item, Food):
-                inventory.append(tile.item.food_name)
-            elif isinstance(tile.item, Plate):
-                for item in tile.item.food:
-                    inventory.append(item.food_name)
-
-        # Cookers (pans)
-        for kx, ky in self.cookers or []:
-            tile = controller.get_tile(controller.get_team(), kx, ky)
-            if tile and isinstance(tile.item, Pan) and tile.item.food:
-                inventory.append(tile.item.food.food_name)
-
+        # Food on counters (loose and plated), then food in pans.
+        self._index_stations(controller)
+        inventory = list(self._counter_foods)
+        inventory.extend([food_name for _, food_name, _ in self._busy_pans])
         return inventory
 
     def find_plate_on_counter(self, controller):
-        for cx, cy in self.counters or []:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if tile and isinstance(tile.item, Plate):
-                return (cx, cy)
-        return None
+        self._index_stations(controller)
+        return self._counter_plates[0] if self._counter_plates else None
 
     def get_plated_inventory(self, controller):
-        plated = []
         # Plates on counters
-        for cx, cy in self.counters or []:
-            tile = controller.get_tile(controller.get_team(), cx, cy)
-            if tile and isinstance(tile.item, Plate):
-                for item in tile.item.food:
-                    plated.append(item.food_name)
+        self._index_stations(controller)
+        plated = list(self._plated_foods)
 
         # Plates in hand
-        for bid in controller.get_team_bot_ids(controller.get_team()):
-            info = controller.get_bot_state(bid)
+        for bid in self._bot_ids:
+            info = self._bot_state(controller, bid)
             holding = info.get('holding')
             if holding and holding.get('type') == 'Plate':
                 for item in holding.get('food', []):
@@ -1068,11 +1497,12 @@ class BotPlayer:
                 if item in required:
                     pending_first.append(item)
                     required.remove(item)
-        ordered = pending_first + [i for i in required if not self.needs_cooking(i)] + \
-            [i for i in required if self.needs_cooking(i)]
+        # Pending items first, then non-cooked before cooked (stable).
+        ordered = pending_first
+        ordered.extend(sorted(required, key=_NEEDS_COOKING.__contains__))
         if priority_item and priority_item in ordered:
             ordered.remove(priority_item)
-            ordered = [priority_item] + ordered
+            ordered.insert(0, priority_item)
         return ordered
 
     def recompute_remaining_for_order(self, controller, state, order, priority_item=None):
@@ -1082,25 +1512,19 @@ class BotPlayer:
         state.ingredients_needed = ordered
         state.task_stage = 20 if not state.ingredients_needed else 10
 
-    def _find_best_reuse_order(self, controller, state, claimed_orders, inventory, turn, require_item=None):
-        orders = controller.get_orders(controller.get_team())
+    def _find_best_reuse_order(self, controller, state, claimed_orders, inventory, require_item=None):
+        have = Counter(inventory)
         best_match = None
         best_match_score = -1
-        for o in orders:
-            if not o['is_active'] or o['expires_turn'] <= turn:
-                continue
+        for o in self._active_orders(controller):
             if o['order_id'] in claimed_orders:
                 if not state.current_order or o['order_id'] != state.current_order['order_id']:
                     continue
             if require_item and require_item not in o['required']:
                 continue
-            needed = list(o['required'])[:]
-            score = 0
-            for inv_item in inventory:
-                if inv_item in needed:
-                    score += 5
-                    needed.remove(inv_item)
-            score += len(o['required'])
+            # 5 per held item the order can use, plus its ingredient count.
+            reuse = sum((have & self._required_counts(o)).values())
+            score = reuse * 5 + len(o['required'])
             if score > best_match_score:
                 best_match_score = score
                 best_match = o
@@ -1129,42 +1553,25 @@ class BotPlayer:
         if order_id is None:
             return
         for st in self.bot_states.values():
+            # add_pending_order keeps ids unique, so one remove is enough.
             if order_id in st.pending_order_ids:
-                st.pending_order_ids = [
-                    oid for oid in st.pending_order_ids if oid != order_id]
+                st.pending_order_ids.remove(order_id)
             if st.pending_items:
                 st.pending_items = []
 
-    def resume_pending_order(self, controller, state, claimed_orders, turn):
+    def resume_pending_order(self, controller, state, claimed_orders):
         if not state.pending_order_ids:
             return False
-        orders = controller.get_orders(controller.get_team())
-        pending_id = state.pending_order_ids[0]
-        pending = next(
-            (o for o in orders if o['order_id'] == pending_id), None)
-        if not pending or not pending['is_active'] or pending['expires_turn'] <= turn:
-            state.pending_order_ids = state.pending_order_ids[1:]
+        pending = self._active_order(controller, state.pending_order_ids[0])
+        if not pending:
+            state.pending_order_ids.pop(0)
             state.pending_items = []
             return False
 
-        required = list(pending['required'])
-        plated = self.get_plated_inventory(controller)
-        for item in plated:
-            if item in required:
-                required.remove(item)
-
-        pending_first = []
-        if state.pending_items:
-            for item in state.pending_items:
-                if item in required:
-                    pending_first.append(item)
-                    required.remove(item)
-
         state.current_order = pending
         claimed_orders.add(pending['order_id'])
-        state.ingredients_needed = pending_first + \
-            [i for i in required if not self.needs_cooking(i)] + \
-            [i for i in required if self.needs_cooking(i)]
+        state.ingredients_needed = self._build_ingredients_needed(
+            controller, state, pending)
         state.task_stage = 1
         return True
 
@@ -1173,33 +1580,30 @@ class BotPlayer:
         inventory = []
 
         # 1. Held item
-        info = controller.get_bot_state(bot_id)
-        holding = info.get('holding')
+        holding = controller.get_bot_state(bot_id).get('holding')
         if holding:
-            if holding.get('type') == 'Food':
+            kind = holding.get('type')
+            if kind == 'Food':
                 inventory.append(holding.get('food_name'))
-            elif holding.get('type') == 'Plate':
+            elif kind == 'Plate':
                 # If plate has food, count it
-                for item in holding.get('food', []):
-                    inventory.append(item['food_name'])
+                inventory.extend([item['food_name'] for item in holding.get('food', [])])
 
         # 2. Plate counter
         if state.plate_counter:
-            tile = controller.get_tile(
-                controller.get_team(), *state.plate_counter)
-            if tile and tile.item:
-                if isinstance(tile.item, Food):
-                    inventory.append(tile.item.food_name)
-                elif isinstance(tile.item, Plate):
-                    for item in tile.item.food:
-                        inventory.append(item.food_name)
+            tile = self._tile(controller, *state.plate_counter)
+            item = tile.item if tile else None
+            if type(item) is Food:
+                inventory.append(item.food_name)
+            elif type(item) is Plate:
+                inventory.extend([food.food_name for food in item.food])
 
         # 3. Work counter
         if state.work_counter:
-            tile = controller.get_tile(
-                controller.get_team(), *state.work_counter)
-            if tile and tile.item and isinstance(tile.item, Food):
-                inventory.append(tile.item.food_name)
+            tile = self._tile(controller, *state.work_counter)
+            item = tile.item if tile else None
+            if type(item) is Food:
+                inventory.append(item.food_name)
 
         return inventory
 
@@ -1209,23 +1613,10 @@ class BotPlayer:
         if not current:
             return False
 
-        turn = controller.get_turn()
-        orders = controller.get_orders(controller.get_team())
-
-        # Find current order object in active orders
-        matching_active = next(
-            (o for o in orders if o['order_id'] == current['order_id']), None)
-
-        is_expired = False
-        if not matching_active:
-            is_expired = True
-        elif not matching_active['is_active']:
-            is_expired = True
-        elif matching_active['expires_turn'] <= turn:
-            is_expired = True
-
-        if is_expired:
-            print(f"[Bot {bot_id}] Order {current['order_id']} expired/gone!")
+        # Gone, completed and expired orders all drop out of the active set.
+        if self._active_order(controller, current['order_id']) is None:
+            if self.debug_board:
+                print(f"[Bot {bot_id}] Order {current['order_id']} expired/gone!")
 
             # Check inventory for "significant progress"
             inventory = self.get_bot_inventory(controller, bot_id, state)
@@ -1236,14 +1627,16 @@ class BotPlayer:
                 state.current_order = None
                 return True
 
-            print(
-                f"[Bot {bot_id}] Has inventory {inventory}, trying to reuse...")
+            if self.debug_board:
+                print(
+                    f"[Bot {bot_id}] Has inventory {inventory}, trying to reuse...")
 
             best_match = self._find_best_reuse_order(
-                controller, state, claimed_orders, inventory, turn)
+                controller, state, claimed_orders, inventory)
             if best_match:
-                print(
-                    f"[Bot {bot_id}] Switched to Order {best_match['order_id']} to reuse ingredients")
+                if self.debug_board:
+                    print(
+                        f"[Bot {bot_id}] Switched to Order {best_match['order_id']} to reuse ingredients")
                 info = controller.get_bot_state(bot_id)
                 holding = info.get('holding')
                 priority_item = None
@@ -1253,8 +1646,9 @@ class BotPlayer:
                 self._switch_to_rescue_order(
                     controller, state, claimed_orders, best_match, priority_item=priority_item)
                 return True
-            print(
-                f"[Bot {bot_id}] No matching order for reuse. Resetting.")
+            if self.debug_board:
+                print(
+                    f"[Bot {bot_id}] No matching order for reuse. Resetting.")
             state.task_stage = 99
             return True
 
@@ -1269,9 +1663,8 @@ class BotPlayer:
             return False
         held_name = holding.get('food_name')
         inventory = self.get_bot_inventory(controller, bot_id, state)
-        turn = controller.get_turn()
         best_match = self._find_best_reuse_order(
-            controller, state, claimed_orders, inventory, turn, require_item=held_name)
+            controller, state, claimed_orders, inventory, require_item=held_name)
         if not best_match:
             return False
         self._switch_to_rescue_order(
@@ -1280,104 +1673,128 @@ class BotPlayer:
         state.task_stage = 12
         return True
 
-    def _dist_from_grid(self, dist_map, pos):
-        if not dist_map or not pos or not self.cached_map:
+    def _min_over_access(self, dist_map, access):
+        # Nearest of a precomputed set of standing tiles, 9999 if none reached.
+        if not dist_map or not access:
             return 9999
-        x, y = pos
-        if self.cached_map.in_bounds(x, y) and self.cached_map.is_tile_walkable(x, y):
-            d = dist_map[x][y]
-            return d if d is not None else 9999
-        return self._distance_to_tile(dist_map, pos)
+        d = min([dist_map[j] for j in access])
+        return d if d != _UNREACHABLE else 9999
 
     def _min_dist_to_cookers(self, dist_map):
-        if not dist_map or not self.cookers:
-            return 9999
-        return min(self._distance_to_tile(dist_map, c) for c in self.cookers)
+        return self._min_over_access(dist_map, self.cooker_access)
 
     def _min_dist_to_counters(self, dist_map):
-        if not dist_map or not self.counters:
-            return 9999
-        return min(self._distance_to_tile(dist_map, c) for c in self.counters)
-
-    def _min_handoff_shop_to_cooker(self):
-        if not self.dist_from_shop or not self.dist_from_cookers or not self.shared_handoff_counters:
-            return 9999
-        best = 9999
-        for c in self.shared_handoff_counters:
-            d = self._distance_to_tile(
-                self.dist_from_shop, c) + self._distance_to_tile(self.dist_from_cookers, c)
-            if d < best:
-                best = d
-        return best
+        return self._min_over_access(dist_map, self.counter_access)
 
-    def simulate_order_time(self, controller, bot_id, state, order, turn):
-        # Lower-bound time estimate to complete the order from current bot state.
+    def simulate_order_time(self, order, turn, bot_pos, have):
+        # Lower-bound time estimate to complete the order for a bot at
+        # bot_pos already holding the ingredients counted in have.
         time_left = order['expires_turn'] - turn
         if time_left <= 0:
             return float('inf')
 
-        info = controller.get_bot_state(bot_id)
-        bot_pos = (info['x'], info['y'])
-
-        required = list(order['required'])
-        inventory = self.get_bot_inventory(controller, bot_id, state)
-        for item in inventory:
-            if item in required:
-                required.remove(item)
+        required = list((self._required_counts(order) - have).elements())
 
+        # A bot always stands on a walkable tile, so its distances are plain
+        # flat reads.
+        i = bot_pos[0] * self.height + bot_pos[1]
         if not required:
-            return self._dist_from_grid(self.dist_from_submit, bot_pos) + 1
+            dist_map = self.dist_from_submit
+            d = dist_map[i] if dist_map else _UNREACHABLE
+            return (d if d != _UNREACHABLE else 9999) + 1
+
+        dist_map = self.dist_from_shop
+        dist_bot_to_shop = dist_map[i] if dist_map else _UNREACHABLE
+        if dist_bot_to_shop == _UNREACHABLE:
+            dist_bot_to_shop = 9999
+        legs_min, prep_cost, dist_shop_to_submit = self.order_legs
+        if dist_bot_to_shop >= 9999 and legs_min >= 9999:
+            return float('inf')
+
+        total = dist_bot_to_shop
+        for ing in required:
+            total += prep_cost[_PREP_CLASS.get(ing, 0)]
+        # Walk to submit, plus one turn to submit.
+        return total + dist_shop_to_submit + 1
 
-        dist_bot_to_shop = self._dist_from_grid(self.dist_from_shop, bot_pos)
+    def _compute_order_legs(self):
+        # The station-to-station legs of simulate_order_time depend only on
+        # the static distance maps: (min leg, per-class cost, shop -> submit).
         dist_shop_to_counter = self._min_dist_to_counters(self.dist_from_shop)
         dist_shop_to_cooker = self._min_dist_to_cookers(self.dist_from_shop)
         dist_counter_to_cooker = self._min_dist_to_cookers(
             self.dist_from_counters)
         dist_shop_to_submit = self._distance_to_tile(
             self.dist_from_shop, self.submit_loc)
-        handoff_shop_to_cooker = self._min_handoff_shop_to_cooker()
+        handoff_shop_to_cooker = self.handoff_shop_to_cooker
 
         if dist_shop_to_cooker >= 9999 and handoff_shop_to_cooker < 9999:
             dist_shop_to_cooker = handoff_shop_to_cooker
         if dist_counter_to_cooker >= 9999 and handoff_shop_to_cooker < 9999:
             dist_counter_to_cooker = handoff_shop_to_cooker
 
-        if min(dist_bot_to_shop, dist_shop_to_counter, dist_shop_to_cooker,
-               dist_counter_to_cooker, dist_shop_to_submit) >= 9999:
-            return float('inf')
+        legs_min = min(dist_shop_to_counter, dist_shop_to_cooker,
+                       dist_counter_to_cooker, dist_shop_to_submit)
 
         BUY = 1
         PLACE = 1
         PICKUP = 1
         CHOP = 1
         TAKE = 1
-        SUBMIT = 1
         COOK_TIME = GameConstants.COOK_PROGRESS
 
-        total = dist_bot_to_shop
-        for ing in required:
-            chop = self.needs_chopping(ing)
-            cook = self.needs_cooking(ing)
-            if chop and cook:
-                total += dist_shop_to_counter + dist_counter_to_cooker
-                total += BUY + PLACE + CHOP + PICKUP + PLACE + TAKE + COOK_TIME
-            elif cook:
-                total += dist_shop_to_cooker
-                total += BUY + PLACE + TAKE + COOK_TIME
-            elif chop:
-                total += dist_shop_to_counter
-                total += BUY + PLACE + CHOP + PICKUP
-            else:
-                total += dist_shop_to_counter
-                total += BUY + PLACE
-
-        total += dist_shop_to_submit + SUBMIT
-        return total
-
-    def _order_is_doable(self, controller, bot_id, state, order, turn):
-        my_dist = self.bot_dist_maps.get(bot_id)
-        if my_dist and not self._has_access(my_dist, self.submit_loc):
-            return False
+        # Per-ingredient cost by _PREP_CLASS: plain, cook, chop, chop + cook.
+        prep_cost = (
+            dist_shop_to_counter + BUY + PLACE,
+            dist_shop_to_cooker + BUY + PLACE + TAKE + COOK_TIME,
+            dist_shop_to_counter + BUY + PLACE + CHOP + PICKUP,
+            dist_shop_to_counter + dist_counter_to_cooker
+            + BUY + PLACE + CHOP + PICKUP + PLACE + TAKE + COOK_TIME,
+        )
+        return legs_min, prep_cost, dist_shop_to_submit
+
+    def _active_orders(self, controller):
+        if self._orders is None:
+            turn = self._turn
+            self._orders = [
+                o for o in controller.get_orders(self._team)
+                if o['is_active'] and o['expires_turn'] > turn]
+            self._orders_by_id = {o['order_id']: o for o in self._orders}
+            self._ranked_orders = {}
+        return self._orders
+
+    def _active_order(self, controller, order_id):
+        self._active_orders(controller)
+        return self._orders_by_id.get(order_id)
+
+    def _team_money(self, controller):
+        if self._money is None:
+            self._money = controller.get_team_money(self._team)
+        return self._money
+
+    def _buy(self, controller, bot_id, item, x, y):
+        self._money = None
+        ok = controller.buy(bot_id, item, x, y)
+        self._forget_tile(x, y)
+        return ok
+
+    def _act(self, action, bot_id, x, y):
+        # Runs a controller tile action (place, pickup, chop, ...) and forgets
+        # the tile it targeted, so later reads this turn see the result.
+        ok = action(bot_id, x, y)
+        self._forget_tile(x, y)
+        return ok
+
+    def _required_counts(self, order):
+        # Multiset of an order's ingredients; an order's list never changes.
+        counts = self.required_counts.get(order['order_id'])
+        if counts is None:
+            counts = Counter(order['required'])
+            self.required_counts[order['order_id']] = counts
+        return counts
+
+    def _order_is_doable(self, order, turn, bot_pos, have):
+        # bot_pos and have (Counter of held ingredients) are fixed per scan.
         time_left = order['expires_turn'] - turn
         if time_left <= 0:
             return False
@@ -1386,10 +1803,23 @@ class BotPlayer:
         safety_buffer = self.expiry_safety_buffer if self.expiry_safety_buffer is not None else 3
         if time_left <= safety_buffer:
             return False
-        sim_time = self.simulate_order_time(
-            controller, bot_id, state, order, turn)
+        if not have and order['required']:
+            # Empty-handed, the station legs alone bound the estimate below.
+            if self._order_floor(order) + safety_buffer > time_left:
+                return False
+        sim_time = self.simulate_order_time(order, turn, bot_pos, have)
         return sim_time + safety_buffer <= time_left
 
+    def _order_floor(self, order):
+        # simulate_order_time for an empty-handed bot standing at the shop.
+        floor = self.order_floors.get(order['order_id'])
+        if floor is None:
+            _, prep_cost, dist_shop_to_submit = self.order_legs
+            floor = sum(prep_cost[_PREP_CLASS.get(ing, 0)] for ing in order['required'])
+            floor += dist_shop_to_submit + 1
+            self.order_floors[order['order_id']] = floor
+        return floor
+
     def _order_has_positive_margin(self, order):
         penalty = order.get('penalty', 0)
         # Skip only if doing the order is worse than letting it expire.
@@ -1397,19 +1827,12 @@ class BotPlayer:
 
     def _order_net_profit(self, order):
         reward = order.get('reward', 0)
-        required = order.get('required', [])
-        total_cost = 0
-        for ing in required:
-            ft = self.get_food_type(ing)
-            if ft is not None:
-                total_cost += ft.buy_cost
+        total_cost = sum(_FOOD_COSTS.get(ing, 0) for ing in order.get('required', []))
         return reward - total_cost
 
-    def calculate_order_heuristic(self, controller, bot_id, state, order, turn, team_money, heuristic=None):
-        # Returns -float('inf') if impossible to complete in time.
-        if not self._order_is_doable(controller, bot_id, state, order, turn):
-            return -float('inf')
-
+    def _order_rank(self, order, turn, heuristic):
+        # Order heuristic score; only meaningful for orders that pass
+        # _order_is_doable.
         ingredient_count = len(order['required'])
         time_left = order['expires_turn'] - turn
 
@@ -1426,8 +1849,48 @@ class BotPlayer:
         # Default: strictly fewer ingredients, time as tie-breaker.
         return (-ingredient_count * 1_000_000) - time_left
 
+    def _ranked(self, controller, heuristic):
+        # Active orders best first under heuristic. The rank does not depend
+        # on the bot, so every bot picking this turn shares one sort (stable,
+        # so ties keep order-list order).
+        orders = self._active_orders(controller)
+        ranked = self._ranked_orders.get(heuristic)
+        if ranked is None:
+            turn = self._turn
+            ranked = sorted(
+                orders, key=lambda o: self._order_rank(o, turn, heuristic), reverse=True)
+            self._ranked_orders[heuristic] = ranked
+        return ranked
+
+    def _best_order(self, controller, bot_id, state, turn, heuristic, claimed_orders=None):
+        # Highest-ranked active order this bot can finish in time. Filtering
+        # the shared ranking keeps its order, so the doability simulation can
+        # stop at the first order that passes.
+        candidates = [
+            o for o in self._ranked(controller, heuristic)
+            if claimed_orders is None or o['order_id'] not in claimed_orders]
+        if not candidates:
+            return None
+        reach = self.bot_reach.get(bot_id)
+        if reach is not None and self.submit_loc not in reach:
+            return None
+        # The bot's position and holdings are the same for every candidate.
+        info = controller.get_bot_state(bot_id)
+        bot_pos = (info['x'], info['y'])
+        have = Counter(self.get_bot_inventory(controller, bot_id, state))
+        for o in candidates:
+            if self._order_is_doable(o, turn, bot_pos, have):
+                return o
+        return None
+
     def play_turn(self, controller: RobotController):
-        bots = controller.get_team_bot_ids(controller.get_team())
+        self._team = controller.get_team()
+        self._turn = controller.get_turn()
+        self._orders = None
+        self._money = None
+        self._start_turn_tiles(controller)
+        bots = controller.get_team_bot_ids(self._team)
+        self._bot_ids = bots
         if not bots:
             return
 
@@ -1440,65 +1903,64 @@ class BotPlayer:
             if bot_id not in self.bot_states:
                 self.bot_states[bot_id] = BotState()
 
-        # Debug: print all bot states
-        turn = controller.get_turn()
-        team = controller.get_team().name
-        debug_info = []
-        for bid in bots:
-            if bid in self.bot_states:
-                info = controller.get_bot_state(bid)
-                state_val = self.bot_states[bid].task_stage
-                debug_info.append(
-                    f"B{bid}:({info['x']},{info['y']})[S{state_val}]")
-        print(f"[{team} Turn {turn}] {' | '.join(debug_info)}")
+        # Each bot only moves itself, so a snapshot taken before anyone acts
+        # still holds a bot's own position when its turn comes up.
+        bot_info = {bid: controller.get_bot_state(bid) for bid in bots}
+        self._bot_info = bot_info
+        self._acting_bot = None
 
         # Reset per-turn handoff flag.
         self.handoff_happened_turn = False
         self.last_handoff_items = []
 
-        # Compute reachability per bot for handoff logic.
+        # Snapshot phase: everything the bots share this turn is read here in
+        # one pass, before any bot acts. The act phase below is serial since
+        # each bot's reservations and claims feed the next bot's choices.
         self.bot_dist_maps = {}
-        for bid in bots:
-            info = controller.get_bot_state(bid)
-            start = (info['x'], info['y'])
-            self.bot_dist_maps[bid] = self._build_dist_map([start])
-        # Helper map if any bot cannot reach submit.
-        self.helper_map_active = any(
-            dm and not self._has_access(dm, self.submit_loc)
-            for dm in self.bot_dist_maps.values())
-
-        # Assign stable work zones per bot once per match.
-        for bid in bots:
-            st = self.bot_states.get(bid)
-            if not st:
-                continue
-            if st.zone_anchor is None:
-                info = controller.get_bot_state(bid)
-                st.zone_anchor = self.choose_work_zone(
-                    (info['x'], info['y']), self.bot_dist_maps.get(bid))
-
-        # Gather shared knowledge
+        self.bot_reach = {}
         reserved_counters = set()
         reserved_cookers = set()
         claimed_orders = set()
         all_bot_positions = {}
-
         for bid in bots:
-            # Positions
-            b_info = controller.get_bot_state(bid)
-            all_bot_positions[bid] = (b_info['x'], b_info['y'])
+            info = bot_info[bid]
+            start = (info['x'], info['y'])
+            all_bot_positions[bid] = start
+            # Reachability per bot for handoff logic. The board is static, so
+            # the map from a given tile is built once per match.
+            dist_map = self.start_dist_maps.get(start)
+            if dist_map is None:
+                dist_map = self._build_dist_map([start])
+                self.start_dist_maps[start] = dist_map
+            self.bot_dist_maps[bid] = dist_map
+            self.bot_reach[bid] = self._component_reach(start)
+
+            st = self.bot_states[bid]
+            # Assign stable work zones per bot once per match.
+            if st.zone_anchor is None:
+                st.zone_anchor = self.choose_work_zone(start, dist_map)
 
             # Reserved resources
-            if bid in self.bot_states:
-                st = self.bot_states[bid]
-                if st.plate_counter:
-                    reserved_counters.add(st.plate_counter)
-                if st.work_counter:
-                    reserved_counters.add(st.work_counter)
-                if st.cooker_target:
-                    reserved_cookers.add(st.cooker_target)
-                if st.current_order:
-                    claimed_orders.add(st.current_order['order_id'])
+            if st.plate_counter:
+                reserved_counters.add(st.plate_counter)
+            if st.work_counter:
+                reserved_counters.add(st.work_counter)
+            if st.cooker_target:
+                reserved_cookers.add(st.cooker_target)
+            if st.current_order:
+                claimed_orders.add(st.current_order['order_id'])
+
+        # Helper map if any bot cannot reach submit.
+        self.helper_map_active = any(
+            dm and not self._has_access(dm, self.submit_loc)
+            for dm in self.bot_dist_maps.values())
+
+        # Debug: print all bot states
+        if self.debug_board:
+            debug_info = [
+                f"B{bid}:{all_bot_positions[bid]}[S{self.bot_states[bid].task_stage}]"
+                for bid in bots]
+            print(f"[{self._team.name} Turn {self._turn}] {' | '.join(debug_info)}")
 
         # Endgame assist: idle bot helps active bot finish ingredients.
         self._assign_endgame_assist(controller, bots)
@@ -1506,18 +1968,21 @@ class BotPlayer:
         # Execute each bot
         # Determine bot index to assign roles
         team_bots = sorted(bots)
+        # Bots never share a tile, so removing a bot's own position leaves
+        # exactly the others.
+        all_positions = set(all_bot_positions.values())
 
         for bot_id in bots:
             if bot_id not in self.bot_states:
                 continue
 
             # Exclude this bot from blocked tiles logic
-            other_bots_locs = {
-                pos for bid, pos in all_bot_positions.items() if bid != bot_id}
+            other_bots_locs = all_positions - {all_bot_positions[bot_id]}
 
             my_state = self.bot_states[bot_id]
-            pre_info = controller.get_bot_state(bot_id)
+            pre_info = bot_info[bot_id]
             pre_pos = (pre_info['x'], pre_info['y'])
+            self._acting_bot = bot_id
 
             # Identify which bot is which
             is_bot_1 = (bot_id == team_bots[0])
@@ -1546,6 +2011,9 @@ class BotPlayer:
                 self._relocate_if_idle(
                     controller, bot_id, my_state, post_pos,
                     self.bot_dist_maps.get(bot_id), other_bots_locs)
+            # Its snapshot is stale now; re-read lazily by later bots.
+            del bot_info[bot_id]
+        self._acting_bot = None
 
     # Bot 1 Behavior
 
@@ -1577,6 +2045,7 @@ class BotPlayer:
                 pass
 
         my_dist = self.bot_dist_maps.get(bot_id)
+        reach = self.bot_reach.get(bot_id, _NO_TILES)
         other_dist_maps = [
             dm for bid, dm in self.bot_dist_maps.items() if bid != bot_id]
         my_reserved_counters = set()
@@ -1607,7 +2076,7 @@ class BotPlayer:
         ux, uy = self.submit_loc
 
         # Helper-side behavior on split maps: cook and handoff without ordering.
-        if my_dist and not self._has_access(my_dist, (ux, uy)):
+        if (ux, uy) not in reach:
             if self.debug_board:
                 h_desc = None
                 if holding:
@@ -1617,10 +2086,14 @@ class BotPlayer:
                         h_desc = holding.get('type')
                 print(
                     f"[Bot {bot_id}] Helper mode holding={h_desc} queue={state.handoff_queue}")
+            # Decode the held food once for both ladders below.
+            held_food = bool(holding) and holding.get('type') == 'Food'
+            if held_food:
+                held_name = holding.get('food_name')
+                stage = holding.get('cooked_stage', 0)
             if state.handoff_queue:
                 order_id, target_item = state.handoff_queue[0]
-                if holding and holding.get('type') == 'Food':
-                    held_name = holding.get('food_name')
+                if held_food:
                     if target_item and held_name != target_item:
                         # Try to rotate queue to match held item if possible.
                         match_idx = next(
@@ -1628,8 +2101,7 @@ class BotPlayer:
                                 state.handoff_queue) if item == held_name),
                             None)
                         if match_idx is not None and match_idx != 0:
-                            state.handoff_queue = state.handoff_queue[match_idx:] + \
-                                state.handoff_queue[:match_idx]
+                            state.handoff_queue.rotate(-match_idx)
                             order_id, target_item = state.handoff_queue[0]
                             if self.debug_board:
                                 print(
@@ -1639,11 +2111,10 @@ class BotPlayer:
                         if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
                                                  order_id_override=order_id, item_name_override=held_name):
                             return
-                    stage = holding.get('cooked_stage', 0)
                     if stage == 1:
                         if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
                                                  order_id_override=order_id, item_name_override=target_item):
-                            state.handoff_queue.pop(0)
+                            state.handoff_queue.popleft()
                             return
                     elif stage == 2:
                         state.task_stage = 99
@@ -1662,17 +2133,15 @@ class BotPlayer:
                             if reserved_cookers is not None:
                                 reserved_cookers.add(cooker)
                         if cooker and self.move_to(controller, bot_id, cooker[0], cooker[1], blocked_tiles):
-                            controller.place(bot_id, cooker[0], cooker[1])
+                            self._act(controller.place, bot_id, cooker[0], cooker[1])
                         return
                 else:
                     handoff_food = self._find_handoff_food(
                         controller, my_dist, require_cookable=True, require_raw=True, item_name=target_item)
                     if handoff_food and self.move_to(controller, bot_id, handoff_food[0], handoff_food[1], blocked_tiles):
-                        if controller.pickup(bot_id, handoff_food[0], handoff_food[1]):
+                        if self._act(controller.pickup, bot_id, handoff_food[0], handoff_food[1]):
                             return
-            if holding and holding.get('type') == 'Food':
-                held_name = holding.get('food_name')
-                stage = holding.get('cooked_stage', 0)
+            if held_food:
                 if stage == 1:
                     if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
                         return
@@ -1680,34 +2149,23 @@ class BotPlayer:
                     state.task_stage = 99
                     return
                 else:
-                    if self.needs_chopping(held_name) and self.needs_cooking(held_name):
+                    # chop*2 + cook, as in _PREP_CLASS.
+                    prep = _PREP_CLASS.get(held_name, 0)
+                    if prep:
                         if state.task_stage != 12 or not state.ingredients_needed or state.ingredients_needed[0] != held_name:
                             state.ingredients_needed = [held_name]
                             state.sub_state = 0
                             state.task_stage = 12
-                        self.process_chop_cook(
-                            controller, bot_id, state, holding, reserved_counters, blocked_tiles, held_name,
-                            my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
-                            reserved_cookers=reserved_cookers)
-                        return
-                    if self.needs_cooking(held_name):
-                        if state.task_stage != 12 or not state.ingredients_needed or state.ingredients_needed[0] != held_name:
-                            state.ingredients_needed = [held_name]
-                            state.sub_state = 0
-                            state.task_stage = 12
-                        self.process_cook_only(
-                            controller, bot_id, state, holding, reserved_counters, blocked_tiles, held_name,
-                            my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
-                            reserved_cookers=reserved_cookers)
-                        return
-                    if self.needs_chopping(held_name):
-                        if state.task_stage != 12 or not state.ingredients_needed or state.ingredients_needed[0] != held_name:
-                            state.ingredients_needed = [held_name]
-                            state.sub_state = 0
-                            state.task_stage = 12
-                        self.process_chop_only(
-                            controller, bot_id, state, holding, reserved_counters, blocked_tiles,
-                            my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper)
+                        if prep == 2:
+                            self.process_chop_only(
+                                controller, bot_id, state, holding, reserved_counters, blocked_tiles,
+                                my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper)
+                        else:
+                            process = self.process_chop_cook if prep == 3 else self.process_cook_only
+                            process(
+                                controller, bot_id, state, holding, reserved_counters, blocked_tiles, held_name,
+                                my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
+                                reserved_cookers=reserved_cookers)
                         return
                     if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
                         return
@@ -1717,32 +2175,30 @@ class BotPlayer:
                     return
             else:
                 # If cooked food is ready on a cooker, retrieve it.
-                for kx, ky in self.cookers or []:
-                    if my_dist and not self._has_access(my_dist, (kx, ky)):
+                busy_pans = self.get_busy_pans(controller)
+                for (kx, ky), _, stage in busy_pans:
+                    if (kx, ky) not in reach:
                         continue
-                    tile = controller.get_tile(controller.get_team(), kx, ky)
-                    if tile and isinstance(tile.item, Pan) and tile.item.food:
-                        if tile.item.food.cooked_stage == 1:
-                            if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
-                                controller.take_from_pan(bot_id, kx, ky)
-                            return
+                    if stage == 1:
+                        if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
+                            self._act(controller.take_from_pan, bot_id, kx, ky)
+                        return
                 # If cooking is in progress, stay near the cooker instead of re-picking.
-                for kx, ky in self.cookers or []:
-                    if my_dist and not self._has_access(my_dist, (kx, ky)):
+                for (kx, ky), _, stage in busy_pans:
+                    if (kx, ky) not in reach:
                         continue
-                    tile = controller.get_tile(controller.get_team(), kx, ky)
-                    if tile and isinstance(tile.item, Pan) and tile.item.food:
-                        if tile.item.food.cooked_stage == 0:
-                            self.move_to(controller, bot_id,
-                                         kx, ky, blocked_tiles)
-                            return
+                    if stage == 0:
+                        self.move_to(controller, bot_id,
+                                     kx, ky, blocked_tiles)
+                        return
                 # Otherwise, look for new handoff items to cook.
                 handoff_food = self._find_handoff_food(
                     controller, my_dist, require_cookable=True, require_raw=True)
                 if handoff_food:
-                    print(f"[Bot {bot_id}] Helper pickup at {handoff_food}")
+                    if self.debug_board:
+                        print(f"[Bot {bot_id}] Helper pickup at {handoff_food}")
                 if handoff_food and self.move_to(controller, bot_id, handoff_food[0], handoff_food[1], blocked_tiles):
-                    if controller.pickup(bot_id, handoff_food[0], handoff_food[1]):
+                    if self._act(controller.pickup, bot_id, handoff_food[0], handoff_food[1]):
                         info2 = controller.get_bot_state(bot_id)
                         holding2 = info2.get('holding')
                         if holding2 and holding2.get('type') == 'Food':
@@ -1755,463 +2211,470 @@ class BotPlayer:
                 return
 
         # If a handoff happened this turn, re-evaluate order progress immediately.
-        if self.handoff_happened_turn and my_dist and self._has_access(my_dist, (ux, uy)):
+        if self.handoff_happened_turn and (ux, uy) in reach:
             if state.current_order:
                 self.recompute_remaining_for_order(
                     controller, state, state.current_order)
                 return
             if state.pending_order_ids:
-                if self.resume_pending_order(controller, state, claimed_orders, controller.get_turn()):
+                if self.resume_pending_order(controller, state, claimed_orders):
                     return
             # Try to complete any active order from available inventory.
-            orders = controller.get_orders(controller.get_team())
-            inventory = self.get_world_inventory(controller)
-            for o in orders:
-                if not o['is_active'] or o['expires_turn'] <= controller.get_turn():
-                    continue
+            have = Counter(self.get_world_inventory(controller))
+            for o in self._active_orders(controller):
                 if o['order_id'] in claimed_orders:
                     continue
-                required = list(o['required'])
-                for item in inventory:
-                    if item in required:
-                        required.remove(item)
-                if not required:
+                if not self._required_counts(o) - have:
                     self.recompute_remaining_for_order(controller, state, o)
                     claimed_orders.add(o['order_id'])
                     return
 
         # Stuck detection
-        if state.task_stage == state.last_state:
-            state.stuck_counter += 1
-            if state.stuck_counter > 10:
-                if state.task_stage == 12 and holding and holding.get('type') == 'Food' and holding.get('cooked_stage', 0) == 0:
-                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                        state.stuck_counter = 0
-                        return
+        if state.note_stage() > 10:
+            if state.task_stage == 12 and holding and holding.get('type') == 'Food' and holding.get('cooked_stage', 0) == 0:
+                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
+                    state.stuck_counter = 0
+                    return
+            if self.debug_board:
                 print(
                     f"[Bot {bot_id}] STUCK in state {state.task_stage}, forcing escape move")
-                self._stuck_escape_move(
-                    controller, bot_id, (bx, by), my_dist, blocked_tiles)
-                state.stuck_counter = 0
-                return
-        else:
+            self._stuck_escape_move(
+                controller, bot_id, (bx, by), my_dist, blocked_tiles)
             state.stuck_counter = 0
-        state.last_state = state.task_stage
+            return
 
         # Burnt food check
         if holding and holding.get('type') == 'Food' and holding.get('cooked_stage') == 2:
             state.task_stage = 99
 
-        # State 0: Pick order
-        if state.task_stage == 0:
-            state.ingredients_needed = []
-            state.plate_counter = None
-            state.work_counter = None
-            state.sub_state = 0
-            state.current_order = None
-            state.cooker_target = None
-            state.cooker_target = None
-
-            # Helper mode for split maps: pick up cookable handoff items if no shop access.
-            if not holding and my_dist and not self._can_access_any_shop(my_dist):
-                handoff_food = self._find_handoff_food(
-                    controller, my_dist, require_cookable=True, require_raw=True)
-                if handoff_food:
-                    hx, hy = handoff_food
-                    if self.move_to(controller, bot_id, hx, hy, blocked_tiles):
-                        if controller.pickup(bot_id, hx, hy):
-                            info2 = controller.get_bot_state(bot_id)
-                            holding2 = info2.get('holding')
-                            if holding2 and holding2.get('type') == 'Food':
-                                state.ingredients_needed = [
-                                    holding2.get('food_name')]
-                            else:
-                                state.ingredients_needed = []
-                            state.task_stage = 12
-                            return
-
-            if state.pending_order_ids:
-                if self.resume_pending_order(controller, state, claimed_orders, controller.get_turn()):
-                    return
-                if len(state.pending_order_ids) >= 3:
-                    # Stop taking new orders until pending ones are cleared.
-                    return
+        ctx = TurnContext(
+            holding, (bx, by), my_dist, other_dist_maps, exclude_counters,
+            reserved_counters, reserved_cookers, claimed_orders, blocked_tiles, order_heuristic,
+            shop_pos=shop_pos, is_helper=is_helper, reach=reach)
+        handler = self._standard_handlers.get(state.task_stage)
+        if handler:
+            handler(controller, bot_id, state, ctx)
 
-            orders = controller.get_orders(controller.get_team())
-            turn = controller.get_turn()
-            team_money = controller.get_team_money(controller.get_team())
+    def _standard_pick_order(self, controller, bot_id, state, ctx):
+        # State 0: Pick order
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        claimed_orders = ctx.claimed_orders
+        blocked_tiles = ctx.blocked_tiles
+        order_heuristic = ctx.order_heuristic
+
+        state.ingredients_needed = []
+        state.plate_counter = None
+        state.work_counter = None
+        state.sub_state = 0
+        state.current_order = None
+        state.cooker_target = None
+
+        # Helper mode for split maps: pick up cookable handoff items if no shop access.
+        if not holding and my_dist and not self._can_access_any_shop(my_dist):
+            handoff_food = self._find_handoff_food(
+                controller, my_dist, require_cookable=True, require_raw=True)
+            if handoff_food:
+                hx, hy = handoff_food
+                if self.move_to(controller, bot_id, hx, hy, blocked_tiles):
+                    if self._act(controller.pickup, bot_id, hx, hy):
+                        info2 = controller.get_bot_state(bot_id)
+                        holding2 = info2.get('holding')
+                        if holding2 and holding2.get('type') == 'Food':
+                            state.ingredients_needed = [
+                                holding2.get('food_name')]
+                        else:
+                            state.ingredients_needed = []
+                        state.task_stage = 12
+                        return
 
-            best = None
-            best_score = -float('inf')
+        if state.pending_order_ids:
+            if self.resume_pending_order(controller, state, claimed_orders):
+                return
+            if len(state.pending_order_ids) >= 3:
+                # Stop taking new orders until pending ones are cleared.
+                return
 
-            for o in orders:
-                # Filter inactive, expired, or claimed by OTHER bots
-                if o['is_active'] and o['expires_turn'] > turn:
-                    if o['order_id'] in claimed_orders:
-                        continue
+        best = self._best_order(
+            controller, bot_id, state, self._turn, order_heuristic, claimed_orders)
 
-                    score = self.calculate_order_heuristic(
-                        controller, bot_id, state, o, turn, team_money, order_heuristic)
+        if best:
+            state.current_order = best
+            # Claim it immediately for subsequent bots in this turn
+            claimed_orders.add(best['order_id'])
 
-                    if score > best_score:
-                        best_score = score
-                        best = o
+            # Non-cooking first (sorted is stable: False < True)
+            state.ingredients_needed = sorted(
+                best['required'], key=_NEEDS_COOKING.__contains__)
+            state.task_stage = 1
+        else:
+            if not holding and self.shop_loc:
+                self.move_to(
+                    controller, bot_id, self.shop_loc[0], self.shop_loc[1], blocked_tiles)
 
-            if best:
-                state.current_order = best
-                # Claim it immediately for subsequent bots in this turn
-                claimed_orders.add(best['order_id'])
+    def _standard_ensure_pan(self, controller, bot_id, state, ctx):
+        # State 1: Ensure pan
+        holding = ctx.holding
+        blocked_tiles = ctx.blocked_tiles
+        sx, sy = ctx.shop_pos
 
-                req = list(best['required'])
-                # Non-cooking first
-                state.ingredients_needed = [i for i in req if not self.needs_cooking(i)] + \
-                    [i for i in req if self.needs_cooking(i)]
-                state.task_stage = 1
+        if not _NEEDS_COOKING.isdisjoint(state.ingredients_needed):
+            if self.get_free_cooker(controller):
+                state.task_stage = 2
             else:
-                if not holding and self.shop_loc:
-                    self.move_to(
-                        controller, bot_id, self.shop_loc[0], self.shop_loc[1], blocked_tiles)
-
-        # State 1: Ensure pan
-        elif state.task_stage == 1:
-            if any(self.needs_cooking(i) for i in state.ingredients_needed):
-                if self.get_free_cooker(controller):
-                    state.task_stage = 2
-                else:
-                    cooker = self.get_cooker_needing_pan(controller)
-                    if cooker:
-                        kx, ky = cooker
-                        if holding:
-                            if holding.get('type') == 'Pan':
-                                if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
-                                    controller.place(bot_id, kx, ky)
-                                    state.task_stage = 2
-                            else:
-                                state.task_stage = 99
+                cooker = self.get_cooker_needing_pan(controller)
+                if cooker:
+                    kx, ky = cooker
+                    if holding:
+                        if holding.get('type') == 'Pan':
+                            if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
+                                self._act(controller.place, bot_id, kx, ky)
+                                state.task_stage = 2
                         else:
-                            if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
-                                if controller.get_team_money(controller.get_team()) >= ShopCosts.PAN.buy_cost:
-                                    controller.buy(
-                                        bot_id, ShopCosts.PAN, sx, sy)
+                            state.task_stage = 99
                     else:
-                        # No cooker available/needing pan? Assume setup is ok or wait
-                        state.task_stage = 2
-            else:
-                state.task_stage = 2
+                        if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
+                            if self._team_money(controller) >= ShopCosts.PAN.buy_cost:
+                                self._buy(controller, bot_id, ShopCosts.PAN, sx, sy)
+                else:
+                    # No cooker available/needing pan? Assume setup is ok or wait
+                    state.task_stage = 2
+        else:
+            state.task_stage = 2
 
+    def _standard_place_plate(self, controller, bot_id, state, ctx):
         # State 2: Buy/place plate
-        elif state.task_stage == 2:
-            if not state.plate_counter:
-                existing_plate = self.find_plate_on_counter(controller)
-                if existing_plate:
-                    state.plate_counter = existing_plate
-                    state.task_stage = 10
-                    return
-            if holding:
-                if holding.get('type') == 'Plate':
-                    if not state.plate_counter:
-                        anchor = self.cooker_priority[0] if self.cooker_priority else None
-                        state.plate_counter = self.get_free_counter(
-                            controller,
-                            exclude=exclude_counters,
-                            bot_pos=(bx, by),
-                            blocked_tiles=blocked_tiles,
-                            anchor_pos=anchor,
-                            zone_anchor=state.zone_anchor,
-                            next_target=self.submit_loc,
-                            bot_dist_map=my_dist)
-
-                    if state.plate_counter:
-                        if my_dist and not self._has_access(my_dist, state.plate_counter):
-                            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                                return
-                            state.plate_counter = None
-                            state.task_stage = 2
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        reach = ctx.reach
+        other_dist_maps = ctx.other_dist_maps
+        exclude_counters = ctx.exclude_counters
+        reserved_counters = ctx.reserved_counters
+        blocked_tiles = ctx.blocked_tiles
+        bx, by = ctx.bot_pos
+        sx, sy = ctx.shop_pos
+
+        if not state.plate_counter:
+            existing_plate = self.find_plate_on_counter(controller)
+            if existing_plate:
+                state.plate_counter = existing_plate
+                state.task_stage = 10
+                return
+        if holding:
+            if holding.get('type') == 'Plate':
+                if not state.plate_counter:
+                    anchor = self.cooker_priority[0] if self.cooker_priority else None
+                    state.plate_counter = self.get_free_counter(
+                        controller,
+                        exclude=exclude_counters,
+                        bot_pos=(bx, by),
+                        blocked_tiles=blocked_tiles,
+                        anchor_pos=anchor,
+                        zone_anchor=state.zone_anchor,
+                        next_target=self.submit_loc,
+                        bot_dist_map=my_dist)
+
+                if state.plate_counter:
+                    if state.plate_counter not in reach:
+                        if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
                             return
-                        # Reserve it
-                        reserved_counters.add(state.plate_counter)
-
-                        px, py = state.plate_counter
-                        adjacent = self.move_to(
-                            controller, bot_id, px, py, blocked_tiles)
-                        if adjacent:
-                            if controller.place(bot_id, px, py):
-                                state.task_stage = 10
-                    else:
+                        state.plate_counter = None
+                        state.task_stage = 2
+                        return
+                    # Reserve it
+                    reserved_counters.add(state.plate_counter)
+
+                    px, py = state.plate_counter
+                    adjacent = self.move_to(
+                        controller, bot_id, px, py, blocked_tiles)
+                    if adjacent:
+                        if self._act(controller.place, bot_id, px, py):
+                            state.task_stage = 10
+                else:
+                    if self.debug_board:
                         print(
                             f"Error: No plate counter available for Bot {bot_id}")
-                else:
-                    state.task_stage = 99
-            else:
-                adjacent = self.move_to(
-                    controller, bot_id, sx, sy, blocked_tiles)
-                money = controller.get_team_money(controller.get_team())
-                if adjacent:
-                    if money >= ShopCosts.PLATE.buy_cost:
-                        controller.buy(bot_id, ShopCosts.PLATE, sx, sy)
-
-        # State 10: Next ingredient
-        elif state.task_stage == 10:
-            if not state.ingredients_needed:
-                state.task_stage = 20
             else:
-                state.sub_state = 0
-                state.work_counter = None
-                state.task_stage = 11
-
+                state.task_stage = 99
+        else:
+            adjacent = self.move_to(
+                controller, bot_id, sx, sy, blocked_tiles)
+            money = self._team_money(controller)
+            if adjacent:
+                if money >= ShopCosts.PLATE.buy_cost:
+                    self._buy(controller, bot_id, ShopCosts.PLATE, sx, sy)
+
+    def _standard_buy_ingredient(self, controller, bot_id, state, ctx):
         # State 11: Buy ingredient
-        elif state.task_stage == 11:
-            if not state.ingredients_needed:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        reach = ctx.reach
+        other_dist_maps = ctx.other_dist_maps
+        reserved_counters = ctx.reserved_counters
+        blocked_tiles = ctx.blocked_tiles
+        sx, sy = ctx.shop_pos
+
+        if not state.ingredients_needed:
+            state.task_stage = 20
+            return
 
-            ing = state.ingredients_needed[0]
-            ft = self.get_food_type(ing)
+        ing = state.ingredients_needed[0]
+        ft = _FOOD_TYPES.get(ing)
 
-            if holding:
-                if holding.get('type') == 'Food':
-                    # verify it's the right food
-                    if holding.get('food_name') == ing:
-                        state.task_stage = 12
-                    else:
-                        state.task_stage = 99
+        if holding:
+            if holding.get('type') == 'Food':
+                # verify it's the right food
+                if holding.get('food_name') == ing:
+                    state.task_stage = 12
                 else:
                     state.task_stage = 99
             else:
-                # CHECK IF WE ALREADY HAVE IT ON MAP
-                loc, is_cooking = self.find_existing_ingredient(
-                    controller, ing)
-
+                state.task_stage = 99
+        else:
+            # CHECK IF WE ALREADY HAVE IT ON MAP
+            loc, is_cooking = self.find_existing_ingredient(
+                controller, ing)
+
+            if loc:
+                if loc not in reach:
+                    # Ignore unreachable items; try to get it ourselves or handoff.
+                    loc = None
+                    is_cooking = False
                 if loc:
-                    if my_dist and not self._has_access(my_dist, loc):
-                        # Ignore unreachable items; try to get it ourselves or handoff.
-                        loc = None
-                        is_cooking = False
-                    if loc:
-                        if is_cooking:
-                            # Cooking in execution
-                            if self.needs_chopping(ing):
-                                state.sub_state = 4
-                            else:
-                                state.sub_state = 1
+                    if is_cooking:
+                        # Cooking in execution
+                        if ing in _NEEDS_CHOPPING:
+                            state.sub_state = 4
                         else:
-                            tile = controller.get_tile(
-                                controller.get_team(), *loc)
-                            if self.needs_cooking(ing) and my_dist and not self._can_access_any_cooker(my_dist):
-                                # Can't cook on this side; ignore raw handoff items, but allow cooked pickups.
-                                if tile and isinstance(tile.item, Food) and tile.item.cooked_stage == 1:
-                                    if self.debug_board:
-                                        print(
-                                            f"[Bot {bot_id}] Accept cooked {tile.item.food_name} at {loc}")
-                                else:
-                                    if self.debug_board and tile and isinstance(tile.item, Food):
-                                        print(
-                                            f"[Bot {bot_id}] Ignore raw {tile.item.food_name} at {loc} (no cooker access)")
-                                    loc = None
-                                    is_cooking = False
-                            if loc:
-                                state.work_counter = loc
-                                reserved_counters.add(loc)
-
-                                # Check status
-                                if tile and isinstance(tile.item, Food):
-                                    is_chopped = tile.item.chopped
-
-                                    if self.needs_chopping(ing):
-                                        if is_chopped:
-                                            state.sub_state = 2  # Pickup chopped
-                                        else:
-                                            state.sub_state = 1  # Chop
-                                    else:
-                                        state.sub_state = 0
-
+                            state.sub_state = 1
+                    else:
+                        tile = self._tile(controller, *loc)
+                        # Loose food on the counter, else None.
+                        item = tile.item if tile else None
+                        food = item if type(item) is Food else None
+                        if ing in _NEEDS_COOKING and my_dist and not self._can_access_any_cooker(my_dist):
+                            # Can't cook on this side; ignore raw handoff items, but allow cooked pickups.
+                            if food is not None and food.cooked_stage == 1:
+                                if self.debug_board:
+                                    print(
+                                        f"[Bot {bot_id}] Accept cooked {food.food_name} at {loc}")
+                            else:
+                                if self.debug_board and food is not None:
+                                    print(
+                                        f"[Bot {bot_id}] Ignore raw {food.food_name} at {loc} (no cooker access)")
+                                loc = None
+                                is_cooking = False
                         if loc:
-                            state.task_stage = 12
-                            return
+                            state.work_counter = loc
+                            reserved_counters.add(loc)
 
-                # Buy only if not found
-                if my_dist and not self._has_access(my_dist, (sx, sy)):
-                    # Can't access shop; try to handoff if holding something.
-                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                        return
-                cost = ft.buy_cost
-                money = controller.get_team_money(controller.get_team())
-                if money < cost:
-                    # Only use boxes when we can't afford the shop item.
-                    box_loc = self.find_box_with_ingredient(controller, ing)
-                    if box_loc:
-                        bx2, by2 = box_loc
-                        if my_dist and not self._has_access(my_dist, (bx2, by2)):
-                            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                                return
-                        if self.move_to(controller, bot_id, bx2, by2, blocked_tiles):
-                            if controller.pickup(bot_id, bx2, by2):
-                                state.task_stage = 12
-                        return
+                            # Check status
+                            if food is not None:
+                                is_chopped = food.chopped
+
+                                if ing in _NEEDS_CHOPPING:
+                                    if is_chopped:
+                                        state.sub_state = 2  # Pickup chopped
+                                    else:
+                                        state.sub_state = 1  # Chop
+                                else:
+                                    state.sub_state = 0
 
-                if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
-                    if money >= cost:
-                        controller.buy(bot_id, ft, sx, sy)
+                    if loc:
                         state.task_stage = 12
+                        return
+
+            # Buy only if not found
+            if (sx, sy) not in reach:
+                # Can't access shop; try to handoff if holding something.
+                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
+                    return
+            cost = ft.buy_cost
+            money = self._team_money(controller)
+            if money < cost:
+                # Only use boxes when we can't afford the shop item.
+                box_loc = self.find_box_with_ingredient(controller, ing)
+                if box_loc:
+                    bx2, by2 = box_loc
+                    if (bx2, by2) not in reach:
+                        if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
+                            return
+                    if self.move_to(controller, bot_id, bx2, by2, blocked_tiles):
+                        if self._act(controller.pickup, bot_id, bx2, by2):
+                            state.task_stage = 12
+                    return
+
+            if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
+                if money >= cost:
+                    self._buy(controller, bot_id, ft, sx, sy)
+                    state.task_stage = 12
 
+    def _standard_process(self, controller, bot_id, state, ctx):
         # State 12: Process
-        elif state.task_stage == 12:
-            if not state.ingredients_needed:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        other_dist_maps = ctx.other_dist_maps
+        reserved_counters = ctx.reserved_counters
+        reserved_cookers = ctx.reserved_cookers
+        blocked_tiles = ctx.blocked_tiles
+        is_helper = ctx.is_helper
+        bx, by = ctx.bot_pos
+        ux, uy = self.submit_loc
 
-            ing = state.ingredients_needed[0]
-            chop = self.needs_chopping(ing)
-            cook = self.needs_cooking(ing)
-            if self.debug_board:
-                held_desc = None
-                if holding:
-                    if holding.get('type') == 'Food':
-                        held_desc = f"{holding.get('food_name')}:{holding.get('cooked_stage', 0)}"
-                    else:
-                        held_desc = holding.get('type')
-                can_cook = self._can_access_any_cooker(
-                    my_dist) if my_dist else False
-                can_shop = self._can_access_any_shop(
-                    my_dist) if my_dist else False
-                can_submit = self._has_access(
-                    my_dist, (ux, uy)) if my_dist else False
-                print(
-                    f"[Bot {bot_id}] State12 ing={ing} sub={state.sub_state} holding={held_desc} can_cook={can_cook} can_shop={can_shop} can_submit={can_submit}")
-
-            if chop and cook:
-                self.process_chop_cook(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
-                    my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
-                    reserved_cookers=reserved_cookers)
-            elif cook:
-                self.process_cook_only(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
-                    my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
-                    reserved_cookers=reserved_cookers)
-            elif chop:
-                self.process_chop_only(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles,
-                    my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper)
-            else:
-                state.task_stage = 13
+        if not state.ingredients_needed:
+            state.task_stage = 20
+            return
 
-        # State 13: Add to plate
-        elif state.task_stage == 13:
-            if state.assist_item and holding and holding.get('type') == 'Food':
-                if holding.get('food_name') == state.assist_item:
-                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
-                                             order_id_override=state.assist_order_id, item_name_override=state.assist_item):
-                        self._clear_assist_state(state)
-                        return
+        ing = state.ingredients_needed[0]
+        # chop*2 + cook, precomputed per ingredient name.
+        prep = _PREP_CLASS.get(ing, 0)
+        if self.debug_board:
+            held_desc = None
+            if holding:
+                if holding.get('type') == 'Food':
+                    held_desc = f"{holding.get('food_name')}:{holding.get('cooked_stage', 0)}"
                 else:
+                    held_desc = holding.get('type')
+            can_cook = self._can_access_any_cooker(
+                my_dist) if my_dist else False
+            can_shop = self._can_access_any_shop(
+                my_dist) if my_dist else False
+            can_submit = self._has_access(
+                my_dist, (ux, uy)) if my_dist else False
+            print(
+                f"[Bot {bot_id}] State12 ing={ing} sub={state.sub_state} holding={held_desc} can_cook={can_cook} can_shop={can_shop} can_submit={can_submit}")
+
+        if prep == 3:
+            self.process_chop_cook(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
+                my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
+                reserved_cookers=reserved_cookers, bot_pos=(bx, by))
+        elif prep == 1:
+            self.process_cook_only(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
+                my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
+                reserved_cookers=reserved_cookers, bot_pos=(bx, by))
+        elif prep == 2:
+            self.process_chop_only(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles,
+                my_dist=my_dist, other_dist_maps=other_dist_maps, helper_mode=is_helper,
+                bot_pos=(bx, by))
+        else:
+            state.task_stage = 13
+
+    def _standard_add_to_plate(self, controller, bot_id, state, ctx):
+        # State 13: Add to plate
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        reach = ctx.reach
+        other_dist_maps = ctx.other_dist_maps
+        blocked_tiles = ctx.blocked_tiles
+        ux, uy = self.submit_loc
+
+        if state.assist_item and holding and holding.get('type') == 'Food':
+            if holding.get('food_name') == state.assist_item:
+                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
+                                         order_id_override=state.assist_order_id, item_name_override=state.assist_item):
                     self._clear_assist_state(state)
-            if holding and holding.get('type') == 'Food':
-                if holding.get('cooked_stage', 0) == 1:
-                    if my_dist and not self._has_access(my_dist, (ux, uy)):
-                        if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                            return
+                    return
+            else:
+                self._clear_assist_state(state)
+        if holding and holding.get('type') == 'Food':
+            if holding.get('cooked_stage', 0) == 1:
+                if (ux, uy) not in reach:
+                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
+                        return
+        if not state.plate_counter:
+            state.task_stage = 2
+            return
+
+        px, py = state.plate_counter
+        if (px, py) not in reach:
+            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
+                return
+            state.plate_counter = None
+            state.task_stage = 2
+            return
+        tile = self._tile(controller, px, py)
+        if not tile or type(tile.item) is not Plate:
+            # Plate was taken or moved; re-acquire a new plate.
+            state.plate_counter = None
+            state.task_stage = 2
+            return
+
+        if self.move_to(controller, bot_id, px, py, blocked_tiles):
+            if self._act(controller.add_food_to_plate, bot_id, px, py):
+                if state.ingredients_needed:
+                    state.ingredients_needed.pop(0)
+                state.task_stage = 10
+
+    def _standard_pickup_plate(self, controller, bot_id, state, ctx):
+        # State 20: Pickup plate
+        holding = ctx.holding
+        reach = ctx.reach
+        blocked_tiles = ctx.blocked_tiles
+
+        if holding:
+            if holding.get('type') == 'Plate':
+                state.task_stage = 21
+            else:
+                state.task_stage = 99
+        else:
             if not state.plate_counter:
                 state.task_stage = 2
                 return
 
             px, py = state.plate_counter
-            if my_dist and not self._has_access(my_dist, (px, py)):
-                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                    return
+            if (px, py) not in reach:
                 state.plate_counter = None
-                state.task_stage = 2
+                state.task_stage = 0
                 return
-            tile = controller.get_tile(controller.get_team(), px, py)
-            if not tile or not isinstance(tile.item, Plate):
-                # Plate was taken or moved; re-acquire a new plate.
+            tile = self._tile(controller, px, py)
+            if not tile or type(tile.item) is not Plate:
+                # Plate missing; go buy/place another.
                 state.plate_counter = None
                 state.task_stage = 2
                 return
 
             if self.move_to(controller, bot_id, px, py, blocked_tiles):
-                if controller.add_food_to_plate(bot_id, px, py):
-                    if state.ingredients_needed:
-                        state.ingredients_needed.pop(0)
-                    state.task_stage = 10
-
-        # State 20: Pickup plate
-        elif state.task_stage == 20:
-            if holding:
-                if holding.get('type') == 'Plate':
+                if self._act(controller.pickup, bot_id, px, py):
                     state.task_stage = 21
-                else:
-                    state.task_stage = 99
-            else:
-                if not state.plate_counter:
-                    state.task_stage = 2
-                    return
-
-                px, py = state.plate_counter
-                if my_dist and not self._has_access(my_dist, (px, py)):
-                    state.plate_counter = None
-                    state.task_stage = 0
-                    return
-                tile = controller.get_tile(controller.get_team(), px, py)
-                if not tile or not isinstance(tile.item, Plate):
-                    # Plate missing; go buy/place another.
-                    state.plate_counter = None
-                    state.task_stage = 2
-                    return
-
-                if self.move_to(controller, bot_id, px, py, blocked_tiles):
-                    if controller.pickup(bot_id, px, py):
-                        state.task_stage = 21
 
+    def _standard_submit(self, controller, bot_id, state, ctx):
         # State 21: Submit
-        elif state.task_stage == 21:
-            if holding and holding.get('type') != 'Plate':
-                state.task_stage = 99
-                return
-            if not holding:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        reach = ctx.reach
+        other_dist_maps = ctx.other_dist_maps
+        blocked_tiles = ctx.blocked_tiles
+        ux, uy = self.submit_loc
 
-            if my_dist and not self._has_access(my_dist, (ux, uy)):
-                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
-                    return
-            if self.move_to(controller, bot_id, ux, uy, blocked_tiles):
-                if controller.can_submit(bot_id, ux, uy):
-                    if controller.submit(bot_id, ux, uy):
-                        print(f"[Bot {bot_id}] submit OK")
-                        state.pending_order_id = None
-                        state.pending_items = []
-                        state.task_stage = 0
-                        state.cooker_target = None
-                    else:
-                        state.task_stage = 20
-                else:
-                    print(
-                        f"[Bot {bot_id}] submit blocked: can_submit=False holding={holding}")
+        if holding and holding.get('type') != 'Plate':
+            state.task_stage = 99
+            return
+        if not holding:
+            state.task_stage = 20
+            return
 
-        # State 99: Trash
-        elif state.task_stage == 99:
-            if self._try_rescue_before_trash(controller, bot_id, state, claimed_orders):
+        if (ux, uy) not in reach:
+            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles):
                 return
-            if holding and self.trash_loc:
-                tx, ty = self.trash_loc
-                if self.move_to(controller, bot_id, tx, ty, blocked_tiles):
-                    controller.trash(bot_id, tx, ty)
+        if self.move_to(controller, bot_id, ux, uy, blocked_tiles):
+            if controller.can_submit(bot_id, ux, uy):
+                if self._act(controller.submit, bot_id, ux, uy):
+                    self._orders = None
+                    self._money = None
+                    if self.debug_board:
+                        print(f"[Bot {bot_id}] submit OK")
+                    state.pending_items = []
                     state.task_stage = 0
-                    state.sub_state = 0
-                    state.ingredients_needed = []
-                    state.plate_counter = None
-                    state.work_counter = None
-                    state.current_order = None
                     state.cooker_target = None
+                else:
+                    state.task_stage = 20
             else:
-                state.task_stage = 0
-                state.sub_state = 0
-                state.ingredients_needed = []
-                state.plate_counter = None
-                state.work_counter = None
-                state.current_order = None
-                state.cooker_target = None
+                if self.debug_board:
+                    print(
+                        f"[Bot {bot_id}] submit blocked: can_submit=False holding={holding}")
 
     def run_normal_logic(self, controller, bot_id, state, reserved_counters, reserved_cookers, claimed_orders, blocked_tiles, order_heuristic):
         # Snapshot3 normal-map logic (no helper/handoff behaviors).
@@ -2228,9 +2691,6 @@ class BotPlayer:
             my_reserved_counters.add(state.work_counter)
         exclude_counters = reserved_counters - my_reserved_counters
 
-        sx, sy = self.shop_loc
-        ux, uy = self.submit_loc
-
         if state.assist_item:
             if not self._assist_target_active(controller, state):
                 self._clear_assist_state(state)
@@ -2242,318 +2702,343 @@ class BotPlayer:
                 state.task_stage = 11
 
         # Stuck detection
-        if state.task_stage == state.last_state:
-            state.stuck_counter += 1
-            if state.stuck_counter > 10:
+        if state.note_stage() > 10:
+            if self.debug_board:
                 print(
                     f"[Bot {bot_id}] STUCK in state {state.task_stage}, forcing escape move")
-                self._stuck_escape_move(
-                    controller, bot_id, (bx, by), my_dist, blocked_tiles)
-                state.stuck_counter = 0
-                return
-        else:
+            self._stuck_escape_move(
+                controller, bot_id, (bx, by), my_dist, blocked_tiles)
             state.stuck_counter = 0
-        state.last_state = state.task_stage
+            return
 
         # Burnt food check
         if holding and holding.get('type') == 'Food' and holding.get('cooked_stage') == 2:
             state.task_stage = 99
 
-        # State 0: Pick order
-        if state.task_stage == 0:
-            state.ingredients_needed = []
-            state.plate_counter = None
-            state.work_counter = None
-            state.sub_state = 0
-            state.current_order = None
+        ctx = TurnContext(
+            holding, (bx, by), my_dist, other_dist_maps, exclude_counters,
+            reserved_counters, reserved_cookers, claimed_orders, blocked_tiles, order_heuristic)
+        handler = self._normal_handlers.get(state.task_stage)
+        if handler:
+            handler(controller, bot_id, state, ctx)
 
-            orders = controller.get_orders(controller.get_team())
-            turn = controller.get_turn()
-            team_money = controller.get_team_money(controller.get_team())
+    def _normal_pick_order(self, controller, bot_id, state, ctx):
+        # State 0: Pick order
+        holding = ctx.holding
+        claimed_orders = ctx.claimed_orders
+        blocked_tiles = ctx.blocked_tiles
+        order_heuristic = ctx.order_heuristic
+
+        state.ingredients_needed = []
+        state.plate_counter = None
+        state.work_counter = None
+        state.sub_state = 0
+        state.current_order = None
 
-            best = None
-            best_score = -float('inf')
+        best = self._best_order(
+            controller, bot_id, state, self._turn, order_heuristic, claimed_orders)
 
-            for o in orders:
-                # Filter inactive, expired, or claimed by OTHER bots
-                if o['is_active'] and o['expires_turn'] > turn:
-                    if o['order_id'] in claimed_orders:
-                        continue
+        if best:
+            state.current_order = best
+            # Claim it immediately for subsequent bots in this turn
+            claimed_orders.add(best['order_id'])
 
-                    score = self.calculate_order_heuristic(
-                        controller, bot_id, state, o, turn, team_money, order_heuristic)
+            # Non-cooking first (sorted is stable: False < True)
+            state.ingredients_needed = sorted(
+                best['required'], key=_NEEDS_COOKING.__contains__)
+            state.task_stage = 1
+        else:
+            if not holding and self.shop_loc:
+                self.move_to(
+                    controller, bot_id, self.shop_loc[0], self.shop_loc[1], blocked_tiles)
 
-                    if score > best_score:
-                        best_score = score
-                        best = o
-
-            if best:
-                state.current_order = best
-                # Claim it immediately for subsequent bots in this turn
-                claimed_orders.add(best['order_id'])
+    def _normal_ensure_pan(self, controller, bot_id, state, ctx):
+        # State 1: Ensure pan
+        holding = ctx.holding
+        blocked_tiles = ctx.blocked_tiles
+        sx, sy = self.shop_loc
 
-                req = list(best['required'])
-                # Non-cooking first
-                state.ingredients_needed = [i for i in req if not self.needs_cooking(i)] + \
-                    [i for i in req if self.needs_cooking(i)]
-                state.task_stage = 1
+        if not _NEEDS_COOKING.isdisjoint(state.ingredients_needed):
+            if self.get_free_cooker(controller):
+                state.task_stage = 2
             else:
-                if not holding and self.shop_loc:
-                    self.move_to(
-                        controller, bot_id, self.shop_loc[0], self.shop_loc[1], blocked_tiles)
-
-        # State 1: Ensure pan
-        elif state.task_stage == 1:
-            if any(self.needs_cooking(i) for i in state.ingredients_needed):
-                if self.get_free_cooker(controller):
-                    state.task_stage = 2
-                else:
-                    cooker = self.get_cooker_needing_pan(controller)
-                    if cooker:
-                        kx, ky = cooker
-                        if holding:
-                            if holding.get('type') == 'Pan':
-                                if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
-                                    controller.place(bot_id, kx, ky)
-                                    state.task_stage = 2
-                            else:
-                                state.task_stage = 99
+                cooker = self.get_cooker_needing_pan(controller)
+                if cooker:
+                    kx, ky = cooker
+                    if holding:
+                        if holding.get('type') == 'Pan':
+                            if self.move_to(controller, bot_id, kx, ky, blocked_tiles):
+                                self._act(controller.place, bot_id, kx, ky)
+                                state.task_stage = 2
                         else:
-                            if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
-                                if controller.get_team_money(controller.get_team()) >= ShopCosts.PAN.buy_cost:
-                                    controller.buy(
-                                        bot_id, ShopCosts.PAN, sx, sy)
+                            state.task_stage = 99
                     else:
-                        # No cooker available/needing pan? Assume setup is ok or wait
-                        state.task_stage = 2
-            else:
-                state.task_stage = 2
+                        if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
+                            if self._team_money(controller) >= ShopCosts.PAN.buy_cost:
+                                self._buy(controller, bot_id, ShopCosts.PAN, sx, sy)
+                else:
+                    # No cooker available/needing pan? Assume setup is ok or wait
+                    state.task_stage = 2
+        else:
+            state.task_stage = 2
 
+    def _normal_place_plate(self, controller, bot_id, state, ctx):
         # State 2: Buy/place plate
-        elif state.task_stage == 2:
-            if holding:
-                if holding.get('type') == 'Plate':
-                    if not state.plate_counter:
-                        anchor = self.cooker_priority[0] if self.cooker_priority else None
-                        state.plate_counter = self.get_free_counter(
-                            controller,
-                            exclude=exclude_counters,
-                            bot_pos=(bx, by),
-                            blocked_tiles=blocked_tiles,
-                            anchor_pos=anchor,
-                            zone_anchor=state.zone_anchor,
-                            next_target=self.submit_loc,
-                            bot_dist_map=my_dist)
-
-                    if state.plate_counter:
-                        # Reserve it
-                        reserved_counters.add(state.plate_counter)
-
-                        px, py = state.plate_counter
-                        adjacent = self.move_to(
-                            controller, bot_id, px, py, blocked_tiles)
-                        if adjacent:
-                            if controller.place(bot_id, px, py):
-                                state.task_stage = 10
-                    else:
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        exclude_counters = ctx.exclude_counters
+        reserved_counters = ctx.reserved_counters
+        blocked_tiles = ctx.blocked_tiles
+        bx, by = ctx.bot_pos
+        sx, sy = self.shop_loc
+
+        if holding:
+            if holding.get('type') == 'Plate':
+                if not state.plate_counter:
+                    anchor = self.cooker_priority[0] if self.cooker_priority else None
+                    state.plate_counter = self.get_free_counter(
+                        controller,
+                        exclude=exclude_counters,
+                        bot_pos=(bx, by),
+                        blocked_tiles=blocked_tiles,
+                        anchor_pos=anchor,
+                        zone_anchor=state.zone_anchor,
+                        next_target=self.submit_loc,
+                        bot_dist_map=my_dist)
+
+                if state.plate_counter:
+                    # Reserve it
+                    reserved_counters.add(state.plate_counter)
+
+                    px, py = state.plate_counter
+                    adjacent = self.move_to(
+                        controller, bot_id, px, py, blocked_tiles)
+                    if adjacent:
+                        if self._act(controller.place, bot_id, px, py):
+                            state.task_stage = 10
+                else:
+                    if self.debug_board:
                         print(
                             f"Error: No plate counter available for Bot {bot_id}")
-                else:
-                    state.task_stage = 99
             else:
-                adjacent = self.move_to(
-                    controller, bot_id, sx, sy, blocked_tiles)
-                money = controller.get_team_money(controller.get_team())
-                if adjacent:
-                    if money >= ShopCosts.PLATE.buy_cost:
-                        controller.buy(bot_id, ShopCosts.PLATE, sx, sy)
-
+                state.task_stage = 99
+        else:
+            adjacent = self.move_to(
+                controller, bot_id, sx, sy, blocked_tiles)
+            money = self._team_money(controller)
+            if adjacent:
+                if money >= ShopCosts.PLATE.buy_cost:
+                    self._buy(controller, bot_id, ShopCosts.PLATE, sx, sy)
+
+    def _normal_next_ingredient(self, controller, bot_id, state, ctx):
         # State 10: Next ingredient
-        elif state.task_stage == 10:
-            if not state.ingredients_needed:
-                state.task_stage = 20
-            else:
-                state.sub_state = 0
-                state.work_counter = None
-                state.task_stage = 11
+        if not state.ingredients_needed:
+            state.task_stage = 20
+        else:
+            state.sub_state = 0
+            state.work_counter = None
+            state.task_stage = 11
 
+    def _normal_buy_ingredient(self, controller, bot_id, state, ctx):
         # State 11: Buy ingredient
-        elif state.task_stage == 11:
-            if not state.ingredients_needed:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        reserved_counters = ctx.reserved_counters
+        blocked_tiles = ctx.blocked_tiles
+        sx, sy = self.shop_loc
 
-            ing = state.ingredients_needed[0]
-            ft = self.get_food_type(ing)
+        if not state.ingredients_needed:
+            state.task_stage = 20
+            return
 
-            if holding:
-                if holding.get('type') == 'Food':
-                    # verify it's the right food
-                    if holding.get('food_name') == ing:
-                        state.task_stage = 12
-                    else:
-                        state.task_stage = 99
+        ing = state.ingredients_needed[0]
+        ft = _FOOD_TYPES.get(ing)
+
+        if holding:
+            if holding.get('type') == 'Food':
+                # verify it's the right food
+                if holding.get('food_name') == ing:
+                    state.task_stage = 12
                 else:
                     state.task_stage = 99
             else:
-                # CHECK IF WE ALREADY HAVE IT ON MAP
-                loc, is_cooking = self.find_existing_ingredient(
-                    controller, ing)
-
-                if loc:
-                    if is_cooking:
-                        # Cooking in execution
-                        if self.needs_chopping(ing):
-                            state.sub_state = 4
-                        else:
-                            state.sub_state = 1
+                state.task_stage = 99
+        else:
+            # CHECK IF WE ALREADY HAVE IT ON MAP
+            loc, is_cooking = self.find_existing_ingredient(
+                controller, ing)
+
+            if loc:
+                if is_cooking:
+                    # Cooking in execution
+                    if ing in _NEEDS_CHOPPING:
+                        state.sub_state = 4
                     else:
-                        state.work_counter = loc
-                        reserved_counters.add(loc)
-
-                        # Check status
-                        tile = controller.get_tile(controller.get_team(), *loc)
-                        if tile and isinstance(tile.item, Food):
-                            is_chopped = tile.item.chopped
-
-                            if self.needs_chopping(ing):
-                                if is_chopped:
-                                    state.sub_state = 2  # Pickup chopped
-                                else:
-                                    state.sub_state = 1  # Chop
+                        state.sub_state = 1
+                else:
+                    state.work_counter = loc
+                    reserved_counters.add(loc)
+
+                    # Check status
+                    tile = self._tile(controller, *loc)
+                    food = tile.item if tile else None
+                    if type(food) is Food:
+                        is_chopped = food.chopped
+
+                        if ing in _NEEDS_CHOPPING:
+                            if is_chopped:
+                                state.sub_state = 2  # Pickup chopped
                             else:
-                                state.sub_state = 0
+                                state.sub_state = 1  # Chop
+                        else:
+                            state.sub_state = 0
 
-                    state.task_stage = 12
-                    return
+                state.task_stage = 12
+                return
 
-                # Buy only if not found
-                cost = ft.buy_cost
-                money = controller.get_team_money(controller.get_team())
-                if money < cost:
-                    # Only use boxes when we can't afford the shop item.
-                    box_loc = self.find_box_with_ingredient(controller, ing)
-                    if box_loc:
-                        bx2, by2 = box_loc
-                        if self.move_to(controller, bot_id, bx2, by2, blocked_tiles):
-                            if controller.pickup(bot_id, bx2, by2):
-                                state.task_stage = 12
-                        return
+            # Buy only if not found
+            cost = ft.buy_cost
+            money = self._team_money(controller)
+            if money < cost:
+                # Only use boxes when we can't afford the shop item.
+                box_loc = self.find_box_with_ingredient(controller, ing)
+                if box_loc:
+                    bx2, by2 = box_loc
+                    if self.move_to(controller, bot_id, bx2, by2, blocked_tiles):
+                        if self._act(controller.pickup, bot_id, bx2, by2):
+                            state.task_stage = 12
+                    return
 
-                if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
-                    if money >= cost:
-                        controller.buy(bot_id, ft, sx, sy)
-                        state.task_stage = 12
+            if self.move_to(controller, bot_id, sx, sy, blocked_tiles):
+                if money >= cost:
+                    self._buy(controller, bot_id, ft, sx, sy)
+                    state.task_stage = 12
 
+    def _normal_process(self, controller, bot_id, state, ctx):
         # State 12: Process
-        elif state.task_stage == 12:
-            if not state.ingredients_needed:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        reserved_counters = ctx.reserved_counters
+        reserved_cookers = ctx.reserved_cookers
+        blocked_tiles = ctx.blocked_tiles
+        bx, by = ctx.bot_pos
+
+        if not state.ingredients_needed:
+            state.task_stage = 20
+            return
 
-            ing = state.ingredients_needed[0]
-            chop = self.needs_chopping(ing)
-            cook = self.needs_cooking(ing)
-
-            if chop and cook:
-                self.process_chop_cook(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
-                    reserved_cookers=reserved_cookers)
-            elif cook:
-                self.process_cook_only(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
-                    reserved_cookers=reserved_cookers)
-            elif chop:
-                self.process_chop_only(
-                    controller, bot_id, state, holding, reserved_counters, blocked_tiles)
-            else:
-                state.task_stage = 13
+        ing = state.ingredients_needed[0]
+        # chop*2 + cook, precomputed per ingredient name.
+        prep = _PREP_CLASS.get(ing, 0)
+
+        if prep == 3:
+            self.process_chop_cook(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
+                reserved_cookers=reserved_cookers, bot_pos=(bx, by))
+        elif prep == 1:
+            self.process_cook_only(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles, ing,
+                reserved_cookers=reserved_cookers, bot_pos=(bx, by))
+        elif prep == 2:
+            self.process_chop_only(
+                controller, bot_id, state, holding, reserved_counters, blocked_tiles,
+                bot_pos=(bx, by))
+        else:
+            state.task_stage = 13
 
+    def _normal_add_to_plate(self, controller, bot_id, state, ctx):
         # State 13: Add to plate
-        elif state.task_stage == 13:
-            if state.assist_item and holding and holding.get('type') == 'Food':
-                if holding.get('food_name') == state.assist_item:
-                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
-                                             order_id_override=state.assist_order_id, item_name_override=state.assist_item):
-                        self._clear_assist_state(state)
-                        return
-                else:
+        holding = ctx.holding
+        my_dist = ctx.my_dist
+        other_dist_maps = ctx.other_dist_maps
+        blocked_tiles = ctx.blocked_tiles
+
+        if state.assist_item and holding and holding.get('type') == 'Food':
+            if holding.get('food_name') == state.assist_item:
+                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps, blocked_tiles,
+                                         order_id_override=state.assist_order_id, item_name_override=state.assist_item):
                     self._clear_assist_state(state)
+                    return
+            else:
+                self._clear_assist_state(state)
+        if not state.plate_counter:
+            state.task_stage = 2
+            return
+
+        px, py = state.plate_counter
+        tile = self._tile(controller, px, py)
+        if not tile or type(tile.item) is not Plate:
+            # Plate was taken or moved; re-acquire a new plate.
+            state.plate_counter = None
+            state.task_stage = 2
+            return
+
+        if self.move_to(controller, bot_id, px, py, blocked_tiles):
+            if self._act(controller.add_food_to_plate, bot_id, px, py):
+                if state.ingredients_needed:
+                    state.ingredients_needed.pop(0)
+                state.task_stage = 10
+
+    def _normal_pickup_plate(self, controller, bot_id, state, ctx):
+        # State 20: Pickup plate
+        holding = ctx.holding
+        blocked_tiles = ctx.blocked_tiles
+
+        if holding:
+            if holding.get('type') == 'Plate':
+                state.task_stage = 21
+            else:
+                state.task_stage = 99
+        else:
             if not state.plate_counter:
                 state.task_stage = 2
                 return
 
             px, py = state.plate_counter
-            tile = controller.get_tile(controller.get_team(), px, py)
-            if not tile or not isinstance(tile.item, Plate):
-                # Plate was taken or moved; re-acquire a new plate.
+            tile = self._tile(controller, px, py)
+            if not tile or type(tile.item) is not Plate:
+                # Plate missing; go buy/place another.
                 state.plate_counter = None
                 state.task_stage = 2
                 return
 
             if self.move_to(controller, bot_id, px, py, blocked_tiles):
-                if controller.add_food_to_plate(bot_id, px, py):
-                    if state.ingredients_needed:
-                        state.ingredients_needed.pop(0)
-                    state.task_stage = 10
-
-        # State 20: Pickup plate
-        elif state.task_stage == 20:
-            if holding:
-                if holding.get('type') == 'Plate':
+                if self._act(controller.pickup, bot_id, px, py):
                     state.task_stage = 21
-                else:
-                    state.task_stage = 99
-            else:
-                if not state.plate_counter:
-                    state.task_stage = 2
-                    return
-
-                px, py = state.plate_counter
-                tile = controller.get_tile(controller.get_team(), px, py)
-                if not tile or not isinstance(tile.item, Plate):
-                    # Plate missing; go buy/place another.
-                    state.plate_counter = None
-                    state.task_stage = 2
-                    return
-
-                if self.move_to(controller, bot_id, px, py, blocked_tiles):
-                    if controller.pickup(bot_id, px, py):
-                        state.task_stage = 21
 
+    def _normal_submit(self, controller, bot_id, state, ctx):
         # State 21: Submit
-        elif state.task_stage == 21:
-            if holding and holding.get('type') != 'Plate':
-                state.task_stage = 99
-                return
-            if not holding:
-                state.task_stage = 20
-                return
+        holding = ctx.holding
+        blocked_tiles = ctx.blocked_tiles
+        ux, uy = self.submit_loc
 
-            if self.move_to(controller, bot_id, ux, uy, blocked_tiles):
-                if controller.can_submit(bot_id, ux, uy):
-                    if controller.submit(bot_id, ux, uy):
-                        state.task_stage = 0
-                        state.cooker_target = None
-                else:
-                    state.task_stage = 20
+        if holding and holding.get('type') != 'Plate':
+            state.task_stage = 99
+            return
+        if not holding:
+            state.task_stage = 20
+            return
 
-        # State 99: Trash
-        elif state.task_stage == 99:
-            if self._try_rescue_before_trash(controller, bot_id, state, claimed_orders):
-                return
-            if holding and self.trash_loc:
-                tx, ty = self.trash_loc
-                if self.move_to(controller, bot_id, tx, ty, blocked_tiles):
-                    controller.trash(bot_id, tx, ty)
+        if self.move_to(controller, bot_id, ux, uy, blocked_tiles):
+            if controller.can_submit(bot_id, ux, uy):
+                if self._act(controller.submit, bot_id, ux, uy):
+                    self._orders = None
+                    self._money = None
                     state.task_stage = 0
-                    state.sub_state = 0
-                    state.ingredients_needed = []
-                    state.plate_counter = None
-                    state.work_counter = None
-                    state.current_order = None
                     state.cooker_target = None
             else:
+                state.task_stage = 20
+
+    def _normal_trash(self, controller, bot_id, state, ctx):
+        # State 99: Trash
+        holding = ctx.holding
+        claimed_orders = ctx.claimed_orders
+        blocked_tiles = ctx.blocked_tiles
+
+        if self._try_rescue_before_trash(controller, bot_id, state, claimed_orders):
+            return
+        if holding and self.trash_loc:
+            tx, ty = self.trash_loc
+            if self.move_to(controller, bot_id, tx, ty, blocked_tiles):
+                self._act(controller.trash, bot_id, tx, ty)
                 state.task_stage = 0
                 state.sub_state = 0
                 state.ingredients_needed = []
@@ -2561,38 +3046,71 @@ class BotPlayer:
                 state.work_counter = None
                 state.current_order = None
                 state.cooker_target = None
+        else:
+            state.task_stage = 0
+            state.sub_state = 0
+            state.ingredients_needed = []
+            state.plate_counter = None
+            state.work_counter = None
+            state.current_order = None
+            state.cooker_target = None
 
-    def process_chop_only(self, controller, bot_id, state, holding, reserved, blocked, my_dist=None, other_dist_maps=None, helper_mode=False):
+    def _claim_work_counter(self, controller, bot_id, state, reserved, blocked, my_dist, other_dist_maps,
+                            helper_mode, bot_pos, next_target):
+        # Pick (or keep) the chopping counter and lock it. Returns None when
+        # the bot has been handed off or sent to trash instead.
         if not state.work_counter:
-            # Exclude global reserved + own plate counter
-            exclude = set(reserved)
-            if state.plate_counter:
-                exclude.add(state.plate_counter)
-
-            bot_state = controller.get_bot_state(bot_id)
+            if bot_pos is None:
+                bot_state = controller.get_bot_state(bot_id)
+                bot_pos = (bot_state['x'], bot_state['y'])
             anchor = self.cooker_priority[0] if self.cooker_priority else None
+            # Exclude global reserved + own plate counter
             state.work_counter = self.get_free_counter(
                 controller,
-                exclude,
-                bot_pos=(bot_state['x'], bot_state['y']),
+                reserved,
+                bot_pos=bot_pos,
                 blocked_tiles=blocked,
                 anchor_pos=anchor,
                 zone_anchor=state.zone_anchor,
-                next_target=state.plate_counter or self.submit_loc,
-                bot_dist_map=my_dist)
+                next_target=next_target,
+                bot_dist_map=my_dist,
+                extra_exclude=state.plate_counter)
 
         if not state.work_counter:
             state.task_stage = 99
-            return
+            return None
 
         if helper_mode and my_dist and not self._has_access(my_dist, state.work_counter):
             if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                return
+                return None
             state.task_stage = 99
-            return
+            return None
 
         reserved.add(state.work_counter)  # Lock it again
-        wx, wy = state.work_counter
+        return state.work_counter
+
+    def _chop_on_work_counter(self, controller, bot_id, state, blocked, wx, wy):
+        # Chop whatever sits on the work counter; sub_state 2 picks it up.
+        if self.move_to(controller, bot_id, wx, wy, blocked):
+            tile = self._tile(controller, wx, wy)
+            food = tile.item if tile else None
+            if type(food) is Food:
+                if food.chopped:
+                    state.sub_state = 2
+                else:
+                    self._act(controller.chop, bot_id, wx, wy)
+            else:
+                state.task_stage = 11
+                state.sub_state = 0
+
+    def process_chop_only(self, controller, bot_id, state, holding, reserved, blocked, my_dist=None, other_dist_maps=None, helper_mode=False,
+                          bot_pos=None):
+        counter = self._claim_work_counter(
+            controller, bot_id, state, reserved, blocked, my_dist, other_dist_maps, helper_mode, bot_pos,
+            next_target=state.plate_counter or self.submit_loc)
+        if counter is None:
+            return
+        wx, wy = counter
 
         if state.sub_state == 0:  # Place
             if holding:
@@ -2601,7 +3119,7 @@ class BotPlayer:
                         state.task_stage = 13
                         return
                     if self.move_to(controller, bot_id, wx, wy, blocked):
-                        if controller.place(bot_id, wx, wy):
+                        if self._act(controller.place, bot_id, wx, wy):
                             state.sub_state = 1
                 else:
                     state.task_stage = 99
@@ -2609,16 +3127,7 @@ class BotPlayer:
                 state.task_stage = 11
 
         elif state.sub_state == 1:  # Chop
-            if self.move_to(controller, bot_id, wx, wy, blocked):
-                tile = controller.get_tile(controller.get_team(), wx, wy)
-                if tile and isinstance(tile.item, Food):
-                    if tile.item.chopped:
-                        state.sub_state = 2
-                    else:
-                        controller.chop(bot_id, wx, wy)
-                else:
-                    state.task_stage = 11
-                    state.sub_state = 0
+            self._chop_on_work_counter(controller, bot_id, state, blocked, wx, wy)
 
         elif state.sub_state == 2:  # Pickup
             if holding:
@@ -2626,178 +3135,174 @@ class BotPlayer:
                 state.sub_state = 0
             else:
                 if self.move_to(controller, bot_id, wx, wy, blocked):
-                    if controller.pickup(bot_id, wx, wy):
+                    if self._act(controller.pickup, bot_id, wx, wy):
+                        state.task_stage = 13
+                        state.sub_state = 0
+
+    def _place_held_on_cooker(self, controller, bot_id, state, holding, blocked, my_dist, other_dist_maps, helper_mode,
+                              reserved_cookers, bot_pos, placed_sub_state, reserve_cooker):
+        # Holding food bound for a cooker: route finished/burnt food onwards,
+        # else claim a free pan and place it, moving to placed_sub_state.
+        stage = holding.get('cooked_stage', 0)
+        if stage == 1:
+            state.task_stage = 13
+            state.sub_state = 0
+            return
+        elif stage == 2:
+            state.task_stage = 99
+            state.sub_state = 0
+            return
+
+        if helper_mode and my_dist and not any(
+                self._has_access(my_dist, c) for c in self.cookers or []):
+            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
+                return
+            if self.primary_handoff_counter:
+                hx, hy = self.primary_handoff_counter
+                self.move_to(controller, bot_id, hx, hy, blocked)
+            return
+
+        if bot_pos is None:
+            bot_state = controller.get_bot_state(bot_id)
+            bot_pos = (bot_state['x'], bot_state['y'])
+        anchor = state.work_counter or state.plate_counter
+        cooker = None
+        self._index_stations(controller)
+        if state.cooker_target:
+            # (has_pan, food_name, cooked_stage) from the station index.
+            st = self._cooker_state.get(state.cooker_target)
+            if st and st[0] and st[1] is None:
+                cooker = state.cooker_target
+            else:
+                state.cooker_target = None
+
+        if not cooker:
+            cooker = self.choose_cooker(
+                controller,
+                anchor_pos=anchor,
+                bot_pos=bot_pos,
+                blocked_tiles=blocked,
+                want_food=False,
+                reserved_cookers=reserved_cookers,
+                allow_reserved=state.cooker_target)
+            state.cooker_target = cooker
+            if reserve_cooker and cooker and reserved_cookers is not None:
+                reserved_cookers.add(cooker)
+
+        if cooker:
+            kx, ky = cooker
+            if helper_mode:
+                step = self.get_next_step_astar(
+                    controller, bot_pos, kx, ky, blocked=blocked)
+                if step is None:
+                    if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
+                        return
+            if self.move_to(controller, bot_id, kx, ky, blocked):
+                if self._act(controller.place, bot_id, kx, ky):
+                    state.sub_state = placed_sub_state
+        elif self.cookers:
+            self.move_to(controller, bot_id, *
+                         self.cookers[0], blocked_tiles=blocked)
+
+    def _wait_for_cook(self, controller, bot_id, state, holding, blocked, ing, reserved_cookers, bot_pos):
+        # Prefer the assigned cooker to minimize travel.
+        target = state.cooker_target
+        candidates = []
+        if target:
+            candidates.append(target)
+        else:
+            if bot_pos is None:
+                bot_state = controller.get_bot_state(bot_id)
+                bot_pos = (bot_state['x'], bot_state['y'])
+            anchor = state.work_counter or state.plate_counter
+            picked = self.choose_cooker(
+                controller,
+                anchor_pos=anchor,
+                bot_pos=bot_pos,
+                blocked_tiles=blocked,
+                want_food=True,
+                reserved_cookers=reserved_cookers,
+                allow_reserved=state.cooker_target)
+            if picked:
+                state.cooker_target = picked
+                if reserved_cookers is not None:
+                    reserved_cookers.add(picked)
+                candidates.append(picked)
+
+        self._index_stations(controller)
+        cooker_state = self._cooker_state
+        for kx, ky in candidates:
+            st = cooker_state.get((kx, ky))
+            if not st or st[1] is None:
+                continue
+            stage = st[2]
+            if stage == 1:
+                if self.move_to(controller, bot_id, kx, ky, blocked):
+                    if self._act(controller.take_from_pan, bot_id, kx, ky):
                         state.task_stage = 13
                         state.sub_state = 0
+                        state.cooker_target = None
+                return
+            elif stage == 2:
+                if self.move_to(controller, bot_id, kx, ky, blocked):
+                    self._act(controller.take_from_pan, bot_id, kx, ky)
+                state.task_stage = 99
+                state.sub_state = 0
+                state.cooker_target = None
+                return
+            else:
+                if holding is None and len(state.ingredients_needed) > 1 and state.ingredients_needed[0] == ing:
+                    # Defer cooking: work on other ingredients while it finishes.
+                    state.ingredients_needed.pop(0)
+                    state.ingredients_needed.append(ing)
+                    state.task_stage = 10
+                    state.sub_state = 0
+                    return
+                self.move_to(controller, bot_id, kx, ky, blocked)
+                return
+        state.task_stage = 11
+        state.sub_state = 0
 
     def process_cook_only(self, controller, bot_id, state, holding, reserved, blocked, ing,
-                          my_dist=None, other_dist_maps=None, helper_mode=False, reserved_cookers=None):
+                          my_dist=None, other_dist_maps=None, helper_mode=False, reserved_cookers=None,
+                          bot_pos=None):
         if state.sub_state == 0:  # Place on cooker
             if holding:
                 if holding.get('type') == 'Food':
-                    stage = holding.get('cooked_stage', 0)
-                    if stage == 1:
-                        state.task_stage = 13
-                        return
-                    elif stage == 2:
-                        state.task_stage = 99
-                        return
-
-                    if helper_mode and my_dist and not any(
-                            self._has_access(my_dist, c) for c in self.cookers or []):
-                        # No cooker access on this side; handoff raw cookable items.
-                        if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                            return
-                        if self.primary_handoff_counter:
-                            hx, hy = self.primary_handoff_counter
-                            self.move_to(controller, bot_id, hx, hy, blocked)
-                        return
-
-                    bot_state = controller.get_bot_state(bot_id)
-                    anchor = state.work_counter or state.plate_counter
-                    cooker = None
-                    if state.cooker_target:
-                        tx, ty = state.cooker_target
-                        t = controller.get_tile(controller.get_team(), tx, ty)
-                        if t and isinstance(t.item, Pan) and t.item.food is None:
-                            cooker = state.cooker_target
-                        else:
-                            state.cooker_target = None
-
-                    if not cooker:
-                        cooker = self.choose_cooker(
-                            controller,
-                            anchor_pos=anchor,
-                            bot_pos=(bot_state['x'], bot_state['y']),
-                            blocked_tiles=blocked,
-                            want_food=False,
-                            reserved_cookers=reserved_cookers,
-                            allow_reserved=state.cooker_target)
-                        state.cooker_target = cooker
-                        if cooker and reserved_cookers is not None:
-                            reserved_cookers.add(cooker)
-                        if cooker and reserved_cookers is not None:
-                            reserved_cookers.add(cooker)
-
-                    if cooker:
-                        kx, ky = cooker
-                        if helper_mode:
-                            step = self.get_next_step_astar(
-                                controller, (bot_state['x'], bot_state['y']), kx, ky, blocked=blocked)
-                            if step is None:
-                                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                                    return
-                        if self.move_to(controller, bot_id, kx, ky, blocked):
-                            if controller.place(bot_id, kx, ky):
-                                state.sub_state = 1
-                    elif self.cookers:
-                        self.move_to(controller, bot_id, *
-                                     self.cookers[0], blocked_tiles=blocked)
+                    self._place_held_on_cooker(
+                        controller, bot_id, state, holding, blocked, my_dist, other_dist_maps, helper_mode,
+                        reserved_cookers, bot_pos, placed_sub_state=1, reserve_cooker=True)
                 else:
                     state.task_stage = 99
             else:
                 # RECOVERY: Pick up from work_counter if verified
                 if state.work_counter:
                     wx, wy = state.work_counter
-                    tile = controller.get_tile(controller.get_team(), wx, wy)
-                    if tile and isinstance(tile.item, Food):
+                    tile = self._tile(controller, wx, wy)
+                    if tile and type(tile.item) is Food:
                         if self.move_to(controller, bot_id, wx, wy, blocked):
-                            controller.pickup(bot_id, wx, wy)
+                            self._act(controller.pickup, bot_id, wx, wy)
                         return
 
-                for kx, ky in self.cookers:
-                    tile = controller.get_tile(controller.get_team(), kx, ky)
-                    if tile and isinstance(tile.item, Pan) and tile.item.food:
-                        state.sub_state = 1
-                        return
+                if self.get_busy_pans(controller):
+                    state.sub_state = 1
+                    return
                 state.task_stage = 11
                 state.sub_state = 0
 
         elif state.sub_state == 1:  # Wait
-            # Prefer the assigned cooker to minimize travel.
-            target = state.cooker_target
-            candidates = []
-            if target:
-                candidates.append(target)
-            else:
-                bot_state = controller.get_bot_state(bot_id)
-                anchor = state.work_counter or state.plate_counter
-                picked = self.choose_cooker(
-                    controller,
-                    anchor_pos=anchor,
-                    bot_pos=(bot_state['x'], bot_state['y']),
-                    blocked_tiles=blocked,
-                    want_food=True,
-                    reserved_cookers=reserved_cookers,
-                    allow_reserved=state.cooker_target)
-                if picked:
-                    state.cooker_target = picked
-                    if reserved_cookers is not None:
-                        reserved_cookers.add(picked)
-                    candidates.append(picked)
-
-            for kx, ky in candidates:
-                tile = controller.get_tile(controller.get_team(), kx, ky)
-                if not tile or not isinstance(tile.item, Pan) or not tile.item.food:
-                    continue
-                stage = tile.item.food.cooked_stage
-                if stage == 1:
-                    if self.move_to(controller, bot_id, kx, ky, blocked):
-                        if controller.take_from_pan(bot_id, kx, ky):
-                            state.task_stage = 13
-                            state.sub_state = 0
-                            state.cooker_target = None
-                    return
-                elif stage == 2:
-                    if self.move_to(controller, bot_id, kx, ky, blocked):
-                        controller.take_from_pan(bot_id, kx, ky)
-                    state.task_stage = 99
-                    state.sub_state = 0
-                    state.cooker_target = None
-                    return
-                else:
-                    if holding is None and len(state.ingredients_needed) > 1 and state.ingredients_needed[0] == ing:
-                        # Defer cooking: work on other ingredients while it finishes.
-                        state.ingredients_needed.pop(0)
-                        state.ingredients_needed.append(ing)
-                        state.task_stage = 10
-                        state.sub_state = 0
-                        return
-                    self.move_to(controller, bot_id, kx, ky, blocked)
-                    return
-            state.task_stage = 11
-            state.sub_state = 0
+            self._wait_for_cook(controller, bot_id, state, holding, blocked, ing,
+                                reserved_cookers, bot_pos)
 
     def process_chop_cook(self, controller, bot_id, state, holding, reserved, blocked, ing,
-                          my_dist=None, other_dist_maps=None, helper_mode=False, reserved_cookers=None):
-        if not state.work_counter:
-            exclude = set(reserved)
-            if state.plate_counter:
-                exclude.add(state.plate_counter)
-            bot_state = controller.get_bot_state(bot_id)
-            anchor = self.cooker_priority[0] if self.cooker_priority else None
-            state.work_counter = self.get_free_counter(
-                controller,
-                exclude,
-                bot_pos=(bot_state['x'], bot_state['y']),
-                blocked_tiles=blocked,
-                anchor_pos=anchor,
-                zone_anchor=state.zone_anchor,
-                next_target=self.cooker_priority[0] if self.cooker_priority else None,
-                bot_dist_map=my_dist)
-
-        if not state.work_counter:
-            state.task_stage = 99
-            return
-
-        if helper_mode and my_dist and not self._has_access(my_dist, state.work_counter):
-            if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                return
-            state.task_stage = 99
+                          my_dist=None, other_dist_maps=None, helper_mode=False, reserved_cookers=None,
+                          bot_pos=None):
+        counter = self._claim_work_counter(
+            controller, bot_id, state, reserved, blocked, my_dist, other_dist_maps, helper_mode, bot_pos,
+            next_target=self.cooker_priority[0] if self.cooker_priority else None)
+        if counter is None:
             return
-
-        reserved.add(state.work_counter)
-        wx, wy = state.work_counter
+        wx, wy = counter
 
         if state.sub_state == 0:  # Place to chop
             if holding:
@@ -2806,161 +3311,45 @@ class BotPlayer:
                         state.sub_state = 3
                         return
                     if self.move_to(controller, bot_id, wx, wy, blocked):
-                        if controller.place(bot_id, wx, wy):
+                        if self._act(controller.place, bot_id, wx, wy):
                             state.sub_state = 1
                 else:
                     state.task_stage = 99
             else:
-                tile = controller.get_tile(controller.get_team(), wx, wy)
-                if tile and isinstance(tile.item, Food):
+                tile = self._tile(controller, wx, wy)
+                if tile and type(tile.item) is Food:
                     state.sub_state = 1
                 else:
-                    for kx, ky in self.cookers:
-                        t = controller.get_tile(controller.get_team(), kx, ky)
-                        if t and isinstance(t.item, Pan) and t.item.food:
-                            state.sub_state = 4
-                            return
+                    if self.get_busy_pans(controller):
+                        state.sub_state = 4
+                        return
                     state.task_stage = 11
                     state.sub_state = 0
 
         elif state.sub_state == 1:  # Chop
-            if self.move_to(controller, bot_id, wx, wy, blocked):
-                tile = controller.get_tile(controller.get_team(), wx, wy)
-                if tile and isinstance(tile.item, Food):
-                    if tile.item.chopped:
-                        state.sub_state = 2
-                    else:
-                        controller.chop(bot_id, wx, wy)
-                else:
-                    state.task_stage = 11
-                    state.sub_state = 0
+            self._chop_on_work_counter(controller, bot_id, state, blocked, wx, wy)
 
         elif state.sub_state == 2:  # Pickup chopped
             if holding:
                 state.sub_state = 3
             else:
                 if self.move_to(controller, bot_id, wx, wy, blocked):
-                    controller.pickup(bot_id, wx, wy)
+                    self._act(controller.pickup, bot_id, wx, wy)
 
         elif state.sub_state == 3:  # Place on cooker
             if holding:
                 if holding.get('type') == 'Food':
-                    stage = holding.get('cooked_stage', 0)
-                    if stage == 1:
-                        state.task_stage = 13
-                        state.sub_state = 0
-                        return
-                    elif stage == 2:
-                        state.task_stage = 99
-                        state.sub_state = 0
-                        return
-
-                    if helper_mode and my_dist and not any(
-                            self._has_access(my_dist, c) for c in self.cookers or []):
-                        if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                            return
-                        if self.primary_handoff_counter:
-                            hx, hy = self.primary_handoff_counter
-                            self.move_to(controller, bot_id, hx, hy, blocked)
-                        return
-
-                    bot_state = controller.get_bot_state(bot_id)
-                    anchor = state.work_counter or state.plate_counter
-                    cooker = None
-                    if state.cooker_target:
-                        tx, ty = state.cooker_target
-                        t = controller.get_tile(controller.get_team(), tx, ty)
-                        if t and isinstance(t.item, Pan) and t.item.food is None:
-                            cooker = state.cooker_target
-                        else:
-                            state.cooker_target = None
-
-                    if not cooker:
-                        cooker = self.choose_cooker(
-                            controller,
-                            anchor_pos=anchor,
-                            bot_pos=(bot_state['x'], bot_state['y']),
-                            blocked_tiles=blocked,
-                            want_food=False,
-                            reserved_cookers=reserved_cookers,
-                            allow_reserved=state.cooker_target)
-                        state.cooker_target = cooker
-
-                    if cooker:
-                        kx, ky = cooker
-                        if helper_mode:
-                            step = self.get_next_step_astar(
-                                controller, (bot_state['x'], bot_state['y']), kx, ky, blocked=blocked)
-                            if step is None:
-                                if self._attempt_handoff(controller, bot_id, state, my_dist, other_dist_maps or [], blocked):
-                                    return
-                        if self.move_to(controller, bot_id, kx, ky, blocked):
-                            if controller.place(bot_id, kx, ky):
-                                state.sub_state = 4
-                    elif self.cookers:
-                        self.move_to(controller, bot_id, *
-                                     self.cookers[0], blocked_tiles=blocked)
+                    self._place_held_on_cooker(
+                        controller, bot_id, state, holding, blocked, my_dist, other_dist_maps, helper_mode,
+                        reserved_cookers, bot_pos, placed_sub_state=4, reserve_cooker=False)
                 else:
                     state.task_stage = 99
             else:
-                for kx, ky in self.cookers:
-                    tile = controller.get_tile(controller.get_team(), kx, ky)
-                    if tile and isinstance(tile.item, Pan) and tile.item.food:
-                        state.sub_state = 4
-                        return
+                if self.get_busy_pans(controller):
+                    state.sub_state = 4
+                    return
                 state.sub_state = 2
 
         elif state.sub_state == 4:  # Wait for cook
-            # Prefer the assigned cooker to minimize travel.
-            target = state.cooker_target
-            candidates = []
-            if target:
-                candidates.append(target)
-            else:
-                bot_state = controller.get_bot_state(bot_id)
-                anchor = state.work_counter or state.plate_counter
-                picked = self.choose_cooker(
-                    controller,
-                    anchor_pos=anchor,
-                    bot_pos=(bot_state['x'], bot_state['y']),
-                    blocked_tiles=blocked,
-                    want_food=True,
-                    reserved_cookers=reserved_cookers,
-                    allow_reserved=state.cooker_target)
-                if picked:
-                    state.cooker_target = picked
-                    if reserved_cookers is not None:
-                        reserved_cookers.add(picked)
-                    candidates.append(picked)
-
-            for kx, ky in candidates:
-                tile = controller.get_tile(controller.get_team(), kx, ky)
-                if not tile or not isinstance(tile.item, Pan) or not tile.item.food:
-                    continue
-                stage = tile.item.food.cooked_stage
-                if stage == 1:
-                    if self.move_to(controller, bot_id, kx, ky, blocked):
-                        if controller.take_from_pan(bot_id, kx, ky):
-                            state.task_stage = 13
-                            state.sub_state = 0
-                            state.cooker_target = None
-                    return
-                elif stage == 2:
-                    if self.move_to(controller, bot_id, kx, ky, blocked):
-                        controller.take_from_pan(bot_id, kx, ky)
-                    state.task_stage = 99
-                    state.sub_state = 0
-                    state.cooker_target = None
-                    return
-                else:
-                    if holding is None and len(state.ingredients_needed) > 1 and state.ingredients_needed[0] == ing:
-                        # Defer cooking: work on other ingredients while it finishes.
-                        state.ingredients_needed.pop(0)
-                        state.ingredients_needed.append(ing)
-                        state.task_stage = 10
-                        state.sub_state = 0
-                        return
-                    self.move_to(controller, bot_id, kx, ky, blocked)
-                    return
-            state.task_stage = 11
-            state.sub_state = 0
+            self._wait_for_cook(controller, bot_id, state, holding, blocked, ing,
+                                reserved_cookers, bot_pos)
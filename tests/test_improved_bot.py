@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from game import Game  # noqa: E402
+
+BOT_PATH = os.path.join(ROOT, "bots", "improved_bot.py")
+
+# Two rooms joined by a gap at (3, 3) and a far gap at (28, 3). With a bot in
+# the near gap, the route from the top room round through the far gap is
+# longer than the search budget allows.
+CORRIDOR_MAP = """\
+##############################
+#b...........................#
+#............................#
+#............................#
+#............................#
+#............................#
+###.########################.#
+#b...........................#
+#............................#
+#KCU$R########################
+
+ORDERS:
+start=0  duration=50  required=EGG           reward=39 penalty=14
+"""
+
+# The same rooms with the near gap walled up, so every route between them
+# runs through the far gap.
+FAR_GAP_ONLY_MAP = CORRIDOR_MAP.replace("###.####", "########")
+
+START = (3, 5)
+TARGET = (3, 1)
+NEAR_GAP = (3, 3)
+FAR_GAP = (28, 3)
+
+
+def _load(tmp_path, text):
+    map_path = tmp_path / "corridor.txt"
+    map_path.write_text(text)
+    game = Game(BOT_PATH, BOT_PATH, str(map_path))
+    bot, controller = game.red_player, game.red_controller
+    bot._team = controller.get_team()
+    bot.cache_locations(controller)
+    return bot, controller
+
+
+@pytest.fixture
+def player(tmp_path):
+    return _load(tmp_path, CORRIDOR_MAP)
+
+
+def _walk(bot, controller, start, target, blocked):
+    # Follow get_next_step_astar until the bot is next to the target,
+    # returning the tiles it stood on.
+    pos = start
+    path = [pos]
+    for _ in range(bot.width * bot.height):
+        step = bot.get_next_step_astar(controller, pos, *target, blocked=blocked)
+        assert step is not None, path
+        if step == (0, 0):
+            return path
+        pos = (pos[0] + step[0], pos[1] + step[1])
+        assert bot.walkable[pos[0] * bot.height + pos[1]], path
+        assert pos not in blocked, path
+        path.append(pos)
+    pytest.fail("route never reached the target")
+
+
+def test_long_detour_around_blocked_corridor_reaches_target(player):
+    bot, controller = player
+    blocked = {NEAR_GAP}
+    path = _walk(bot, controller, START, TARGET, blocked)
+    assert FAR_GAP in path
+    assert bot._reachable(controller, START, TARGET, blocked)
+
+
+def test_sealed_corridor_is_unreachable(player):
+    bot, controller = player
+    blocked = {NEAR_GAP, FAR_GAP}
+    assert bot.get_next_step_astar(controller, START, *TARGET, blocked=blocked) is None
+    assert not bot._reachable(controller, START, TARGET, blocked)
+
+
+def test_long_route_with_default_blocked_reaches_target(tmp_path):
+    bot, controller = _load(tmp_path, FAR_GAP_ONLY_MAP)
+    # No blocked argument: the search still runs past its budget.
+    step = bot.get_next_step_astar(controller, START, *TARGET)
+    assert step is not None
+    path = _walk(bot, controller, START, TARGET, set())
+    assert FAR_GAP in path
+
+
+def _tile_signature(tile):
+    data = tile.to_dict()
+    item = tile.item
+    data["item"] = item.to_dict() if hasattr(item, "to_dict") else repr(item)
+    data["cook_progress"] = getattr(tile, "cook_progress", None)
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+@pytest.mark.parametrize("map_name", ["simple_map.txt", "map_test.txt"])
+def test_cached_tiles_match_fresh_reads(map_name):
+    # The tile cache is carried across turns; every read it serves must match
+    # what get_tile returns at that moment.
+    game = Game(BOT_PATH, BOT_PATH, os.path.join(ROOT, "maps", map_name),
+                turn_limit=300, per_turn_timeout_s=30)
+    bot = game.red_player
+    cached_tile = bot._tile
+    reads = []
+
+    def checked_tile(controller, x, y):
+        tile = cached_tile(controller, x, y)
+        fresh = controller.get_tile(controller.get_team(), x, y)
+        reads.append((x, y, _tile_signature(tile), _tile_signature(fresh)))
+        return tile
+
+    bot._tile = checked_tile
+    game.run_game()
+    assert reads
+    stale = [(x, y) for x, y, cached, fresh in reads if cached != fresh]
+    assert stale == []